@@ -0,0 +1,128 @@
+'''Runs an asyncio event loop alongside the Tk mainloop.
+Coroutines run on a background thread and their results are handed back to the Tk thread,
+so disk and network waits never hold up the window'''
+
+from asyncio import new_event_loop, run_coroutine_threadsafe
+from concurrent.futures import Future, CancelledError
+from queue import SimpleQueue, Empty
+from threading import Thread
+from tkinter import Tk, TclError
+from typing import Callable, Coroutine, Any
+import atexit
+import traceback
+
+class AsyncBridge:
+    '''An asyncio loop on its own thread, tied to a Tk root.
+
+    Tk widgets must only be touched from the thread running mainloop,
+    so results are never passed to callbacks directly.
+    They are put on a queue that the Tk thread drains every INTERVAL milliseconds.
+
+    ATTRIBUTES
+    root: the Tk root whose thread the callbacks run on.
+    loop: the asyncio event loop.
+    _calls: SimpleQueue of (function, args) waiting to run on the Tk thread.
+    _thread: the thread running loop.
+    _pollJob: id of the next queue drain, or None once closed.
+    '''
+
+    #milliseconds between checks for finished coroutines
+    INTERVAL = 15
+
+    def __init__(self, root: Tk):
+        '''root: the window whose thread callbacks must run on'''
+
+        self.root = root
+        self.loop = new_event_loop()
+        self._calls = SimpleQueue()
+
+        self._thread = Thread(target = self._run, name = "asyncio loop", daemon = True)
+        self._thread.start()
+
+        self._pollJob = self.root.after(self.INTERVAL, self._poll)
+
+        atexit.register(self.close)
+
+
+    def _run(self):
+        self.loop.run_forever()
+        self.loop.close()
+
+
+    def submit(self, coroutine: Coroutine, onResult: Callable[[Any], None] = None,
+            onError: Callable[[BaseException], None] = None) -> Future:
+        '''Run coroutine on the loop. Returns a concurrent.futures.Future of its result.
+
+        coroutine: the coroutine to run. It must not touch any widgets.
+        onResult: (optional) function to call on the Tk thread with the result.
+        onError: (optional) function to call on the Tk thread with the exception if it fails.
+        Errors without an onError are printed'''
+
+        future = run_coroutine_threadsafe(coroutine, self.loop)
+
+        def done(future: Future):
+            try:
+                result = future.result()
+
+            except CancelledError:
+                return
+
+            except BaseException as error:
+                if onError is not None:
+                    self.callSoon(onError, error)
+
+                else:
+                    traceback.print_exception(type(error), error, error.__traceback__)
+
+                return
+
+            if onResult is not None:
+                self.callSoon(onResult, result)
+
+        future.add_done_callback(done)
+        return future
+
+
+    def callSoon(self, function: Callable, *args):
+        '''Call function on the Tk thread. Safe to call from any thread'''
+
+        self._calls.put((function, args))
+
+
+    def _poll(self):
+        '''Run every call waiting for the Tk thread'''
+
+        while True:
+            try:
+                function, args = self._calls.get_nowait()
+
+            except Empty:
+                break
+
+            try:
+                function(*args)
+
+            except Exception:
+                #one bad callback shouldn't stop the rest
+                traceback.print_exc()
+
+        if self._pollJob is not None:
+            self._pollJob = self.root.after(self.INTERVAL, self._poll)
+
+
+    def close(self):
+        '''Stop the loop and its thread. Called automatically on exit'''
+
+        if self._pollJob is None:
+            return
+
+        try:
+            self.root.after_cancel(self._pollJob)
+
+        except TclError:  #the root was destroyed
+            pass
+
+        self._pollJob = None
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
@@ -0,0 +1,95 @@
+'''Process-wide cache for files that are parsed once and reused.
+Files are revalidated with os.stat and only reparsed when they actually change'''
+
+from os import stat
+from hashlib import blake2b
+from threading import Lock
+from time import time
+from typing import Callable, Any, Tuple
+
+class FileCache:
+    '''Keeps the parsed contents of a file in memory.
+
+    Every get() stats the file. If the mtime, size and inode match the last read,
+    the cached value is returned without opening the file.
+    If they differ, the file is read and hashed, and it is only reparsed if the hash changed,
+    so touching or atomically replacing a file with the same contents is cheap.
+    Files modified within RACY_SECONDS of being read are always hashed because
+    a second write in the same mtime tick would not change the stat.
+
+    ATTRIBUTES
+    path: string file path of the cached file.
+    parse: function that takes the file's bytes and returns the value to cache.
+    version: integer that goes up every time the file is reparsed.
+    Use it to tell when anything built from the value must be rebuilt.
+    _value: the cached result of parse.
+    _signature: tuple of (mtime_ns, size, inode) from the last read.
+    _digest: bytes hash of the contents from the last read.
+    _readAt: float time of the last read.
+    _lock: stops two threads from parsing at once.
+    '''
+
+    RACY_SECONDS = 2
+
+    def __init__(self, path: str, parse: Callable[[bytes], Any]):
+        '''path: the file to cache
+        parse: function to turn the file's bytes into the cached value.
+        Exceptions it raises are passed on to the caller of get()'''
+
+        self.path = path
+        self.parse = parse
+        self.version = 0
+
+        self._value = None
+        self._signature = None
+        self._digest = None
+        self._readAt = 0.0
+        self._lock = Lock()
+
+
+    def _stat(self) -> Tuple[int, int, int]:
+        info = stat(self.path)
+        return (info.st_mtime_ns, info.st_size, info.st_ino)
+
+
+    def get(self) -> Any:
+        '''Return the parsed file, reparsing only if it changed on disk
+
+        RAISES
+        OSError: the file can't be read
+        Anything raised by parse'''
+
+        with self._lock:
+            signature = self._stat()
+
+            if signature == self._signature and not self._isRacy(signature):
+                return self._value
+
+            with open(self.path, "rb") as f:
+                contents = f.read()
+
+            digest = blake2b(contents, digest_size = 16).digest()
+
+            if digest != self._digest or self._signature is None:
+                #parse before touching any state so a bad file doesn't poison the cache
+                self._value = self.parse(contents)
+                self._digest = digest
+                self.version += 1
+
+            self._signature = signature
+            self._readAt = time()
+            return self._value
+
+
+    def _isRacy(self, signature: Tuple[int, int, int]) -> bool:
+        '''Check if the file was modified too close to the last read to trust its mtime'''
+
+        return signature[0] / 1e9 >= self._readAt - self.RACY_SECONDS
+
+
+    def invalidate(self):
+        '''Forget the cached value so the next get() reparses'''
+
+        with self._lock:
+            self._signature = None
+            self._digest = None
@@ -0,0 +1,218 @@
+'''Opt in timing of GUI event handlers.
+Wraps handler methods so every call is timed, and watches how late the Tk event loop runs,
+so slow clicks and stalls can be traced back to the handler that caused them'''
+
+from functools import wraps
+from json import dump
+from time import perf_counter
+from tkinter import Tk, TclError
+from typing import Callable, Dict, Any
+import atexit
+
+class LatencyHistogram:
+    '''Counts of how long something took, in milliseconds, grouped into buckets.
+
+    ATTRIBUTES
+    BOUNDS: tuple of the upper bound of each bucket. The last bucket has no upper bound.
+    counts: list of how many times fell in each bucket.
+    count: integer number of times recorded.
+    total: float sum of the times recorded.
+    longest: float longest time recorded.
+    '''
+
+    BOUNDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.longest = 0.0
+
+
+    def add(self, milliseconds: float):
+        '''Record one time'''
+
+        bucket = 0
+        while bucket < len(self.BOUNDS) and milliseconds > self.BOUNDS[bucket]:
+            bucket += 1
+
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.longest = max(self.longest, milliseconds)
+
+
+    def percentile(self, percent: float) -> float:
+        '''Return the upper bound of the bucket that percent of the times fall within.
+        Times past the last bound are given as the longest time'''
+
+        if not self.count:
+            return 0.0
+
+        needed = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(self.BOUNDS, self.counts):
+            seen += count
+            if seen >= needed:
+                return min(bound, self.longest)
+
+        return self.longest
+
+
+    def toDict(self) -> Dict[str, Any]:
+        return {
+            "count" : self.count,
+            "mean" : self.total / self.count if self.count else 0.0,
+            "p50" : self.percentile(50),
+            "p95" : self.percentile(95),
+            "p99" : self.percentile(99),
+            "max" : self.longest,
+            "buckets" : {(f"<={bound}" if bound is not None else f">{self.BOUNDS[-1]}") : count
+                for bound, count in zip(self.BOUNDS + (None, ), self.counts)},
+            }
+
+
+class Instrumentation:
+    '''Records handler latencies and event loop stalls for one Tk root.
+
+    Handlers are timed by wrapping them where they are defined with wrap,
+    so it must be done before any widgets bind them.
+    The event loop is checked by a job that should run every INTERVAL milliseconds.
+    How late it runs is how long the loop was busy and couldn't redraw or handle input.
+
+    ATTRIBUTES
+    root: the Tk root being watched.
+    path: string file path the JSON report is written to.
+    handlers: dict of handler name : LatencyHistogram.
+    gaps: LatencyHistogram of how late the loop check ran.
+    _expected: float perf_counter time the next loop check should run at.
+    _job: id of the next loop check, or None once stopped.
+    _wrapped: list of (owner, name, original) so that unwrapAll can undo wrap.
+    '''
+
+    #milliseconds between event loop checks
+    INTERVAL = 50
+
+    def __init__(self, root: Tk, path: str = "profile.json"):
+        '''root: the window to watch
+        path: (optional) where to write the JSON report. Defaults to profile.json'''
+
+        self.root = root
+        self.path = path
+        self.handlers = {}
+        self.gaps = LatencyHistogram()
+        self._wrapped = []
+
+        self._expected = perf_counter() + self.INTERVAL / 1000
+        self._job = self.root.after(self.INTERVAL, self._check)
+
+        atexit.register(self.stop)
+
+
+    def timer(self, name: str, function: Callable) -> Callable:
+        '''Return function wrapped so each call is recorded under name'''
+
+        histogram = self.handlers.setdefault(name, LatencyHistogram())
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+
+            finally:
+                histogram.add((perf_counter() - start) * 1000)
+
+        return timed
+
+
+    def wrap(self, owner: type, *names: str):
+        '''Time the methods called names on the class owner.
+        Classmethods and staticmethods are supported.
+
+        E.G: profiler.wrap(ToggleButton, "callCommands")'''
+
+        for name in names:
+            original = owner.__dict__[name]
+            label = f"{owner.__name__}.{name}"
+
+            if isinstance(original, (classmethod, staticmethod)):
+                replacement = type(original)(self.timer(label, original.__func__))
+
+            else:
+                replacement = self.timer(label, original)
+
+            setattr(owner, name, replacement)
+            self._wrapped.append((owner, name, original))
+
+
+    def unwrapAll(self):
+        '''Put back every method replaced by wrap'''
+
+        for owner, name, original in reversed(self._wrapped):
+            setattr(owner, name, original)
+
+        self._wrapped = []
+
+
+    def _check(self):
+        now = perf_counter()
+        self.gaps.add(max(0.0, (now - self._expected) * 1000))
+
+        self._expected = now + self.INTERVAL / 1000
+        self._job = self.root.after(self.INTERVAL, self._check)
+
+
+    def report(self) -> Dict[str, Any]:
+        '''Return everything recorded as a dict that can be saved as JSON'''
+
+        return {
+            "handlers" : {name : histogram.toDict() for name, histogram in self.handlers.items() if histogram.count},
+            "loopDelay" : self.gaps.toDict(),
+            }
+
+
+    def summary(self) -> str:
+        '''Return the report as a table, slowest handlers first'''
+
+        rows = sorted(((name, histogram) for name, histogram in self.handlers.items() if histogram.count),
+            key = lambda row: row[1].percentile(99), reverse = True)
+        rows.append(("event loop delay", self.gaps))
+
+        width = max(len(name) for name, histogram in rows)
+        lines = [f"{'handler':<{width}} {'calls':>7} {'mean ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+
+        for name, histogram in rows:
+            mean = histogram.total / histogram.count if histogram.count else 0.0
+            lines.append(f"{name:<{width}} {histogram.count:>7} {mean:>9.2f} {histogram.percentile(99):>9.2f} {histogram.longest:>9.2f}")
+
+        return "\n".join(lines)
+
+
+    def dump(self, event = None):  #event lets it be bound to a key
+        '''Write the JSON report to path and print the summary'''
+
+        try:
+            with open(self.path, "w") as f:
+                dump(self.report(), f, indent = 4)
+
+        except OSError as error:
+            print(f"Could not write {self.path}: {error}")
+
+        print(self.summary())
+
+
+    def stop(self):
+        '''Stop watching the event loop and dump the report. Called automatically on exit'''
+
+        if self._job is None:
+            return
+
+        try:
+            self.root.after_cancel(self._job)
+
+        except TclError:  #the root was destroyed
+            pass
+
+        self._job = None
+        self.dump()
@@ -1,7 +1,7 @@
 '''Utility functions that don't don't belong in any classes
 and classes that don't really belong to the Optimisation project'''
 from tkinter import *
-from typing import Union, Callable , Any, Tuple, List
+from typing import Union, Callable , Any, Tuple, List, Dict, Sequence
 
 def bubbleSort(varList: list)-> list:
     '''Sorts a list of numbers ascending
@@ -136,12 +136,117 @@ def removeFromDict(original: dict, toRemove: Union[Tuple, List])-> Tuple[dict, d
     return editedDict
 
 
+class StyleSheet:
+    '''Cascading settings for a WidgetFactory, similar to CSS style sheets.
+
+    Settings are looked up through these layers, each overriding the one before:
+    global: the defaults for every factory. Copied from WidgetFactory.defaultAttrs.
+    page: the settings the factory was made with.
+    rules: settings for widgets matching a selector of widget type and/or role,
+    where more specific selectors win: any widget < type < role < type and role.
+    Equally specific rules are applied in the order they were added.
+    inline: the settings passed to the builder. These are applied by WidgetFactory.resolve.
+
+    The result for each (type, role) is cached until a layer changes.
+
+    ATTRIBUTES
+    globalLayer: dict of the global settings.
+    pageLayer: dict of the page settings.
+    rules: list of (specificity, order, type name, role, settings).
+    version: integer that goes up whenever a layer changes.
+    _computed: dict of (type name, role) : computed settings.
+    '''
+
+    def __init__(self, globalLayer: dict=None, pageLayer: dict=None):
+        '''globalLayer: (optional) dict of global settings.
+        pageLayer: (optional) dict of page settings'''
+
+        self.globalLayer=dict(globalLayer or {})
+        self.pageLayer=dict(pageLayer or {})
+        self.rules=[]
+        self.version=0
+        self._computed={}
+
+
+    def _changed(self):
+        self.version+=1
+        self._computed={}
+
+
+    def setGlobal(self, **settings):
+        '''Change global settings'''
+
+        self.globalLayer.update(settings)
+        self._changed()
+
+
+    def setPage(self, **settings):
+        '''Change page settings'''
+
+        self.pageLayer.update(settings)
+        self._changed()
+
+
+    def addRule(self, type: Union[Widget, str]=None, role: str=None, **settings):
+        '''Apply settings to widgets of type (a class or its name) and/or with role.
+        Leave both as None to match every widget.
+
+        E.G: styles.addRule(Button, "nav", relief="flat")'''
+
+        typeName=type if type is None or isinstance(type, str) else type.__name__
+        specificity=(typeName is not None)+2*(role is not None)
+
+        self.rules.append((specificity, len(self.rules), typeName, role, dict(settings)))
+        self.rules.sort(key=lambda rule: rule[:2])
+        self._changed()
+
+
+    def computed(self, type: Union[Widget, str]=None, role: str=None) -> dict:
+        '''Return the settings for a widget of type with role, before inline settings.
+        The returned dict is shared so must not be edited.
+
+        type: (optional) widget class or its name. Classes also match rules for their base classes.
+        role: (optional) string role of the widget, like a CSS class'''
+
+        key=(type, role)
+        try:
+            return self._computed[key]
+
+        except KeyError:
+            pass
+
+        if type is None:
+            typeNames=()
+
+        elif isinstance(type, str):
+            typeNames=(type, )
+
+        else:
+            typeNames=tuple(base.__name__ for base in type.__mro__)
+
+        settings=dict(self.globalLayer)
+        settings.update(self.pageLayer)
+
+        for specificity, order, typeName, ruleRole, ruleSettings in self.rules:
+            if (typeName is None or typeName in typeNames) and (ruleRole is None or ruleRole==role):
+                settings.update(ruleSettings)
+
+        self._computed[key]=settings
+        return settings
+
+
 class WidgetFactory:
     '''Class to define the default settings for the factories.
     
     ATTRIBUTES
-    defaultAttrs: dict of the default settings that are overridden at instantiation.
-    These are applied unless overridden by the builders'''
+    defaultAttrs: dict of the global default settings of every factory.
+    Each factory copies them into its own StyleSheet, so editing a factory's styles doesn't affect the others.
+    placementKeys: tuple of the settings used to place the widget instead of being passed to it.
+    styles: the StyleSheet of this factory.
+    The settings passed in at instantiation are its page layer.
+    _templates: dict of (widget type, role, frozenset of given settings) : (widget settings, placement settings).
+    The defaults each build needs, worked out once per combination instead of on every build.
+    _templateVersion: the version of styles that the templates were made from.'''
 
     #attributes
     defaultAttrs={
@@ -157,12 +262,62 @@ class WidgetFactory:
         'sticky': None
         }
 
+    placementKeys=("anchor", "sticky", "relative", "labelText")
+
     def __init__(self, **kwargs):
         '''Pass in any settings that should be applied by default by the builders'''
 
-        #override the default attrs
-        for attr in list(kwargs.keys()):
-            self.defaultAttrs[attr]=kwargs[attr]
+        #the page layer overrides the default attrs for this factory only
+        self.styles=StyleSheet(self.defaultAttrs, kwargs)
+
+        self._templates={}
+        self._templateVersion=self.styles.version
+
+
+    def addRule(self, type: Union[Widget, str]=None, role: str=None, **settings):
+        '''Shortcut for self.styles.addRule. Builders can pick a role with role="name"'''
+
+        self.styles.addRule(type, role, **settings)
+
+
+    def resolve(self, type: Widget, kwargs: Dict[str, Any]) -> Tuple[dict, dict]:
+        '''Does the same job as setToDefaults but through the style sheet,
+        with a cached template per combination of settings.
+        Returns (widget settings, placement settings).
+
+        type: tkinter widget class that is being built.
+        kwargs: the settings passed to the builder. None means use the style sheet.
+        role is used to match style sheet rules and isn't passed to the widget.'''
+
+        role=kwargs.get("role")
+        given={key: value for key, value in kwargs.items() if value is not None and key!="role"}
+
+        #the style sheet has changed since the templates were made
+        if self._templateVersion!=self.styles.version:
+            self._templates={}
+            self._templateVersion=self.styles.version
+
+        templateKey=(type, role, frozenset(given))
+        try:
+            widgetBase, placementBase=self._templates[templateKey]
+
+        except KeyError:
+            defaults=self.styles.computed(type, role)
+            widgetBase={key: value for key, value in defaults.items()
+                if key not in given and key not in self.placementKeys}
+            placementBase={key: defaults[key] for key in self.placementKeys}
+            self._templates[templateKey]=(widgetBase, placementBase)
+
+        widgetParams=dict(widgetBase)
+        placement=dict(placementBase)
+        for key, value in given.items():
+            if key in placement:
+                placement[key]=value
+
+            else:
+                widgetParams[key]=value
+
+        return widgetParams, placement
 
 
     def setToDefaults(self, kwargsDict):
@@ -172,6 +327,8 @@ class WidgetFactory:
 
         kwargsDict: dictionary of keyword arguments.'''
 
+        defaults=self.styles.computed()
+
         #will store all  pairs
         arguments={}
 
@@ -188,13 +345,13 @@ class WidgetFactory:
         #check if a default value for it is stored
         for key in isNone:
             try:
-                arguments[key]=self.defaultAttrs[key]
+                arguments[key]=defaults[key]
 
             except KeyError:  #ignore unknown keys
                 pass
 
         #append all default values to dict if not already given a value
-        for key, value in self.defaultAttrs.items():
+        for key, value in defaults.items():
             if key not in arguments.keys():
                 arguments[key]=value
 
@@ -224,6 +381,7 @@ class WidgetFactory:
         width: float width of the widget.
         fg: string foreground colour.
         bg: string background colour.
+        role: string role used to pick style sheet rules. See StyleSheet.addRule.
         
         Placement Arguments:
         anchor: string anchor point.
@@ -238,45 +396,79 @@ class WidgetFactory:
         #WidgetFactory.defaultAttrs
 
         #set any NoneType kwargs to their defaults
-        kwargsDict=self.setToDefaults(kwargs)
+        widgetParams, placement=self.resolve(type, kwargs)
 
         #if labelText has a value, place a label at x, y-20
-        if kwargsDict["labelText"]:
-            #getting rid of incompatible kwargs
-            labelParams=removeFromDict(kwargsDict, ["command", "text", "relative", "sticky"])
+        if placement["labelText"]:
+            newLabel=self._buildLabel(coords, {**widgetParams, **placement})
 
-            #retrieving label text which is not compatible with label
-            labelText=labelParams.pop("labelText")
+        #expands the dictionary into kwargs again (key = value)
+        newWidget=type(**widgetParams)
+        self._place(newWidget, coords, placement)
 
-            newLabel = Label(text =labelText, **labelParams)
+        if placement["labelText"]:
+            return (newLabel, newWidget)
 
-            #if relative, place at y - 20% of y
-            if kwargsDict["relative"]:
-                newLabel.place(relx = coords[0], rely = coords[1] -(coords[1]*0.2), \
-                    anchor = kwargsDict["anchor"], sticky = kwargsDict["sticky"])
-            else:
-                newLabel.place(x = coords[0], y = (coords[1]-20), \
-                    anchor = kwargsDict["anchor"], sticky = kwargsDict["sticky"])
+        else:
+            return (newWidget)
 
 
-        #removing inconpatible params
-        widgetParams=removeFromDict(kwargsDict, ["anchor", "sticky", "relative", "labelText"])
+    def batchBuilder(self, type: Widget, coordsList: Sequence[tuple], perWidget: Sequence[dict]=None, **kwargs) -> List:
+        '''Builds and places many widgets of the same type in one call.
+        The shared settings are only resolved once.
+        Returns a list of what generalBuilder would return for each widget.
 
-        #expands the dictionary into kwargs again (key = value)
-        newWidget=type(**widgetParams)
+        type: tkinter widget class.
+        coordsList: sequence of the co-ords to place each widget at.
+        perWidget: (optional) sequence of dicts of settings for each widget, such as their text.
+        These override the shared settings.
+        **kwargs: the settings shared by every widget. Same as generalBuilder'''
 
-        #placing the widget
+        if perWidget is not None:
+            return [self.generalBuilder(type, coords, **{**kwargs, **extra}) for coords, extra in zip(coordsList, perWidget)]
+
+        widgetParams, placement=self.resolve(type, kwargs)
+        if placement["labelText"]:
+            return [self.generalBuilder(type, coords, **kwargs) for coords in coordsList]
+
+        widgets=[]
+        for coords in coordsList:
+            newWidget=type(**widgetParams)
+            self._place(newWidget, coords, placement)
+            widgets.append(newWidget)
+
+        return widgets
+
+
+    def _buildLabel(self, coords: tuple, kwargsDict: dict) -> Label:
+        '''Place a label for a widget at co-ords(x, y-20)'''
+
+        #getting rid of incompatible kwargs
+        labelParams=removeFromDict(kwargsDict, ["command", "text", "relative", "sticky"])
+
+        #retrieving label text which is not compatible with label
+        labelText=labelParams.pop("labelText")
+
+        newLabel = Label(text =labelText, **labelParams)
+
+        #if relative, place at y - 20% of y
         if kwargsDict["relative"]:
-            newWidget.place(relx = coords[0], rely = coords[1],\
+            newLabel.place(relx = coords[0], rely = coords[1] -(coords[1]*0.2), \
                 anchor = kwargsDict["anchor"], sticky = kwargsDict["sticky"])
-
         else:
-            newWidget.place(x = coords[0], y = coords[1],\
-                anchor = kwargsDict["anchor"], sticky= kwargsDict["sticky"])
+            newLabel.place(x = coords[0], y = (coords[1]-20), \
+                anchor = kwargsDict["anchor"], sticky = kwargsDict["sticky"])
 
-        if kwargsDict["labelText"]:
-            return (newLabel, newWidget)
+        return newLabel
 
-        else:
-            return (newWidget)
 
+    def _place(self, newWidget: Widget, coords: tuple, placement: dict):
+        '''Place newWidget at co-ords using the placement settings from resolve'''
+
+        if placement["relative"]:
+            newWidget.place(relx = coords[0], rely = coords[1],\
+                anchor = placement["anchor"], sticky = placement["sticky"])
+
+        else:
+            newWidget.place(x = coords[0], y = coords[1],\
+                anchor = placement["anchor"], sticky= placement["sticky"])
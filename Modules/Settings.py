@@ -0,0 +1,134 @@
+'''Settings kept in memory and saved to disk from a background thread'''
+
+from json import load, dump
+from os import replace, fsync
+from threading import Thread, Lock, Condition
+from time import monotonic
+from typing import Any
+import atexit
+import traceback
+
+class Settings:
+    '''The settings file as a dict that saves itself.
+
+    Changes are saved DELAY seconds after the last one, so a burst of changes is one write.
+    Writes go to a temporary file that then replaces the real one,
+    so a crash mid-write can't leave a half written settings file.
+    Unsaved changes are saved when the program exits.
+
+    ATTRIBUTES
+    path: string file path of the settings file.
+    _values: dict of the current settings.
+    _dirty: boolean for whether _values has changes that aren't saved.
+    _lastChange: float monotonic time of the last change.
+    _closed: boolean for whether close has been called.
+    _lock: guards the attributes above.
+    _changed: condition used to wake the writer thread.
+    _writeLock: makes sure only one write happens at once.
+    _writer: the background thread that saves changes.
+    '''
+
+    DELAY = 0.5
+
+    def __init__(self, path: str = "settings.json"):
+        '''path: the settings file to load
+
+        RAISES
+        OSError: the file can't be read
+        json.decoder.JSONDecodeError: the file is in the wrong format'''
+
+        self.path = path
+
+        with open(path) as f:
+            self._values = dict(load(f))
+
+        self._dirty = False
+        self._lastChange = 0.0
+        self._closed = False
+
+        self._lock = Lock()
+        self._changed = Condition(self._lock)
+        self._writeLock = Lock()
+
+        self._writer = Thread(target = self._run, name = "Settings writer", daemon = True)
+        self._writer.start()
+
+        atexit.register(self.close)
+
+
+    def get(self, key: str, default: Any = None) -> Any:
+        '''Return the setting for key, or default if it isn't set'''
+
+        with self._lock:
+            return self._values.get(key, default)
+
+
+    def set(self, key: str, value: Any):
+        '''Change a setting. It is saved in the background shortly after'''
+
+        with self._lock:
+            if key in self._values and self._values[key] == value:
+                return
+
+            self._values[key] = value
+            self._dirty = True
+            self._lastChange = monotonic()
+            self._changed.notify()
+
+
+    def _run(self):
+        '''Writer thread. Waits for changes to stop for DELAY seconds then saves them'''
+
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closed:
+                    self._changed.wait()
+
+                if self._closed:
+                    return  #close saves anything left
+
+                remaining = self._lastChange + self.DELAY - monotonic()
+                if remaining > 0:
+                    self._changed.wait(remaining)
+                    continue
+
+            self.flush()
+
+
+    def flush(self):
+        '''Save any unsaved changes now'''
+
+        with self._writeLock:
+            with self._lock:
+                if not self._dirty:
+                    return
+
+                values = dict(self._values)
+                self._dirty = False
+
+            temporary = f"{self.path}.tmp"
+            try:
+                with open(temporary, "w") as f:
+                    dump(values, f)
+                    f.flush()
+                    fsync(f.fileno())
+
+                replace(temporary, self.path)
+
+            except OSError:
+                #try again on the next change or on exit
+                with self._lock:
+                    self._dirty = True
+
+                traceback.print_exc()
+
+
+    def close(self):
+        '''Stop the writer thread and save any unsaved changes. Called automatically on exit'''
+
+        with self._lock:
+            self._closed = True
+            self._changed.notify()
+
+        self._writer.join()
+        self.flush()
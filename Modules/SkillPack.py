@@ -0,0 +1,236 @@
+'''Compiled binary version of the skills file.
+Opening a pack only maps it into memory, and entries are decoded when they are asked for,
+so it opens in the same time however many skills it holds.
+
+LAYOUT (all integers are little endian unsigned)
+header: magic, version, entry count, hash table slot count,
+    then the offsets of the hash table, entry table and string heap.
+hash table: slots of (alias hash, entry number, alias offset, alias length).
+    Empty slots have an entry number of EMPTY. Collisions probe the next slot.
+entry table: one (key offset, key length, info offset, info length) per entry, in file order.
+    The key is the aliases joined by ", " like in skills.json.
+string heap: the UTF-8 text of every key, alias and info.
+'''
+
+from mmap import mmap, ACCESS_READ
+from os import replace
+from struct import Struct
+from zlib import crc32
+from typing import Dict, Tuple, List, Union, Iterator, Optional
+
+MAGIC = b"RUAEPACK"
+VERSION = 1
+EMPTY = 0xFFFFFFFF
+
+_header = Struct("<8sHxxIIIII")
+_slot = Struct("<IIII")
+_entry = Struct("<IIII")
+
+
+def writePack(skills: Dict[Union[str, Tuple[str,]], str], path: str = "skills.pack"):
+    '''Compile skills into a pack at path.
+
+    skills: dict of aliases : info. Keys can be "alias, alias" strings like
+    dumpToSkills.toSend or tuples like getJson returns'''
+
+    heap = bytearray()
+    entries = []
+    aliases = {}
+
+    def store(text: str) -> Tuple[int, int]:
+        data = text.encode("utf-8")
+        heap.extend(data)
+        return (len(heap) - len(data), len(data))
+
+    for number, (key, info) in enumerate(skills.items()):
+        if isinstance(key, str):
+            key = tuple(key.split(", "))
+
+        entries.append(store(", ".join(key)) + store(info))
+
+        for alias in key:
+            #the first entry to claim an alias wins, like SkillIndex
+            if alias not in aliases:
+                aliases[alias] = number
+
+    #keep the table at most half full so probes stay short
+    slotCount = 1
+    while slotCount < len(aliases) * 2:
+        slotCount *= 2
+
+    slots = [(0, EMPTY, 0, 0)] * slotCount
+    for alias, number in aliases.items():
+        encoded = alias.encode("utf-8")
+        hashed = crc32(encoded)
+        position = hashed & (slotCount - 1)
+
+        while slots[position][1] != EMPTY:
+            position = (position + 1) & (slotCount - 1)
+
+        slots[position] = (hashed, number) + store(alias)
+
+    tableStart = _header.size
+    entriesStart = tableStart + slotCount * _slot.size
+    heapStart = entriesStart + len(entries) * _entry.size
+
+    #written to a temporary file first, so an interrupted write or a reader at the same moment never sees half a pack
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_header.pack(MAGIC, VERSION, len(entries), slotCount, tableStart, entriesStart, heapStart))
+        f.write(b"".join(_slot.pack(*slot) for slot in slots))
+        f.write(b"".join(_entry.pack(*entry) for entry in entries))
+        f.write(heap)
+
+    replace(temporary, path)
+
+
+class SkillPack:
+    '''Read only view of a pack made by writePack.
+    Has the same lookup methods as SkillIndex for exact aliases.
+
+    ATTRIBUTES
+    path: string file path of the pack.
+    _map: the memory mapped file.
+    _count: integer number of entries.
+    _slotCount: integer number of hash table slots. Always a power of two.
+    _tableStart, _entriesStart, _heapStart: integer offsets of each section.
+    '''
+
+    def __init__(self, path: str = "skills.pack"):
+        '''path: the pack to open
+
+        RAISES
+        OSError: the pack can't be opened
+        ValueError: the file isn't a pack, is from a different version or is cut short'''
+
+        self.path = path
+
+        with open(path, "rb") as f:
+            self._map = mmap(f.fileno(), 0, access = ACCESS_READ)
+
+        try:
+            self._checkHeader()
+
+        except ValueError:
+            self._map.close()
+            raise
+
+
+    def _checkHeader(self):
+        '''Read the header and check that every section it describes fits in the file,
+        so lookups never read past the end
+
+        RAISES
+        ValueError: the header is wrong'''
+
+        if len(self._map) < _header.size:
+            raise ValueError(f"{self.path} is not a skills pack")
+
+        magic, version, self._count, self._slotCount, self._tableStart, self._entriesStart, self._heapStart = \
+            _header.unpack_from(self._map, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a skills pack")
+
+        if version != VERSION:
+            raise ValueError(f"{self.path} is version {version} but version {VERSION} is needed")
+
+        #the slot count must be a power of two for the probing to wrap around
+        if self._slotCount == 0 or self._slotCount & (self._slotCount - 1):
+            raise ValueError(f"{self.path} has a broken hash table")
+
+        if (self._tableStart < _header.size
+                or self._tableStart + self._slotCount * _slot.size > self._entriesStart
+                or self._entriesStart + self._count * _entry.size > self._heapStart
+                or self._heapStart > len(self._map)):
+            raise ValueError(f"{self.path} is cut short or broken")
+
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._heapStart + offset
+        return self._map[start:start + length].decode("utf-8")
+
+
+    def _find(self, alias: str) -> Optional[int]:
+        '''Return the entry number of alias, or None if it isn't in the pack'''
+
+        encoded = alias.encode("utf-8")
+        hashed = crc32(encoded)
+        position = hashed & (self._slotCount - 1)
+
+        while True:
+            slotHash, number, offset, length = _slot.unpack_from(self._map, self._tableStart + position * _slot.size)
+
+            if number == EMPTY:
+                return None
+
+            if slotHash == hashed:
+                start = self._heapStart + offset
+                if self._map[start:start + length] == encoded:
+                    return number
+
+            position = (position + 1) & (self._slotCount - 1)
+
+
+    def _entryAt(self, number: int) -> Tuple[int, int, int, int]:
+        return _entry.unpack_from(self._map, self._entriesStart + number * _entry.size)
+
+
+    def get(self, alias: str) -> str:
+        '''Return the info for alias
+
+        RAISES
+        ValueError: alias is not in the pack'''
+
+        number = self._find(alias)
+        if number is None:
+            raise ValueError("Target not found")
+
+        *_, infoOffset, infoLength = self._entryAt(number)
+        return self._text(infoOffset, infoLength)
+
+
+    def keyOf(self, alias: str) -> Tuple[str,]:
+        '''Return the key of the entry that alias belongs to
+
+        RAISES
+        ValueError: alias is not in the pack'''
+
+        number = self._find(alias)
+        if number is None:
+            raise ValueError("Target not found")
+
+        keyOffset, keyLength, *_ = self._entryAt(number)
+        return tuple(self._text(keyOffset, keyLength).split(", "))
+
+
+    def items(self) -> Iterator[Tuple[Tuple[str,], str]]:
+        '''Iterate over (key, info) pairs in file order, decoding as it goes'''
+
+        for number in range(self._count):
+            keyOffset, keyLength, infoOffset, infoLength = self._entryAt(number)
+            yield (tuple(self._text(keyOffset, keyLength).split(", ")), self._text(infoOffset, infoLength))
+
+
+    def aliases(self) -> List[str]:
+        '''Return every alias in file order. Only the keys are decoded, not the info'''
+
+        aliases = []
+        for number in range(self._count):
+            keyOffset, keyLength, *_ = self._entryAt(number)
+            aliases.extend(self._text(keyOffset, keyLength).split(", "))
+
+        return aliases
+
+
+    def close(self):
+        '''Unmap the file'''
+        self._map.close()
+
+
+    def __contains__(self, alias: str) -> bool:
+        return self._find(alias) is not None
+
+
+    def __len__(self) -> int:
+        return self._count
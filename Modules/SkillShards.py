@@ -0,0 +1,363 @@
+'''Skills split into one pack per subject or exam board.
+A folder of skills files is searched through a small index of which pack each alias is in,
+so only the packs that are actually used get read'''
+
+import concurrent.futures  #ProcessPoolExecutor is looked up when needed so multiprocessing isn't always imported
+from json import load, dump
+from os import listdir, stat, replace, path as osPath
+from sys import stderr
+from typing import Dict, Tuple, List, Iterator, Optional
+from Modules.SkillIndex import SkillIndex, AliasTrie, FuzzyMatcher
+
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+
+def readPack(path: str) -> Dict[Tuple[str,], str]:
+    '''Read one skills file into a dict of (alias, alias) : info.
+    Top level so that process pools can send it to workers
+
+    RAISES
+    OSError: the file can't be read
+    ValueError: the file is in the wrong format'''
+
+    with open(path, encoding = "utf-8") as f:
+        skills = load(f)
+
+    #valid JSON can still be a list or number, or have info that isn't text
+    if not isinstance(skills, dict) or not all(isinstance(info, str) for info in skills.values()):
+        raise ValueError("Expecting an object of string keys and string values")
+
+    #convert keys back to list
+    return {tuple(key.split(", ")) : value for key, value in skills.items()}
+
+
+class ShardedSkills:
+    '''Skills spread over a folder of skills files, loaded as they are needed.
+    Has the same lookup methods as SkillIndex.
+
+    The folder's index.json records the aliases and stat of each pack.
+    It is rebuilt for any pack whose stat has changed, so it never has to be edited by hand.
+
+    ATTRIBUTES
+    folder: string path of the folder of packs.
+    packs: dict of pack file name : {"stat" : [mtime_ns, size], "count" : number of skills, "aliases" : [alias]}.
+    _aliases: dict of alias : pack file name.
+    _loaded: dict of pack file name : SkillIndex of the packs read so far.
+    broken: dict of pack file name : [mtime_ns, size] of packs that couldn't be read.
+    They are skipped, with a warning, until they change.
+    _trie: AliasTrie of every alias. Built on the first prefix search.
+    _fuzzy: FuzzyMatcher of every alias. Built on the first suggestion.
+    '''
+
+    def __init__(self, folder: str = "skills"):
+        '''folder: the folder of skills files
+
+        RAISES
+        OSError: the folder can't be read'''
+
+        self.folder = folder
+        self.packs = {}
+        self._aliases = {}
+        self._loaded = {}
+        self.broken = {}
+        self._trie = None
+        self._fuzzy = None
+
+        self._readIndex()
+
+
+    def _path(self, name: str) -> str:
+        return osPath.join(self.folder, name)
+
+
+    def _readIndex(self):
+        '''Load index.json, reindexing any pack that was added, removed or changed since it was written'''
+
+        try:
+            with open(self._path(INDEX_NAME), encoding = "utf-8") as f:
+                index = load(f)
+
+            if index.get("version") != INDEX_VERSION:
+                index = {}
+
+        except (OSError, ValueError):
+            index = {}
+
+        oldPacks = index.get("packs", {})
+        stats = self._stats()
+        changed = False
+
+        for name, packStat in stats.items():
+            pack = oldPacks.get(name)
+
+            if pack is None or pack["stat"] != packStat:
+                try:
+                    skills = readPack(self._path(name))
+
+                except (OSError, ValueError) as error:
+                    #left out of the index so it is read again once fixed
+                    self._skip(name, error)
+                    changed = True
+                    continue
+
+                self._loaded[name] = SkillIndex(skills)
+                pack = {"stat" : packStat, "count" : len(skills),
+                    "aliases" : [alias for key in skills for alias in key]}
+                changed = True
+
+            self.packs[name] = pack
+
+        self._mapAliases()
+
+        if changed or set(oldPacks) != set(stats):
+            self._writeIndex()
+
+
+    def _stats(self) -> Dict[str, List[int]]:
+        '''Return a dict of pack file name : [mtime_ns, size] for every pack in the folder, by name.
+        This is cheap compared to reading them'''
+
+        names = sorted(name for name in listdir(self.folder) if name.endswith(".json") and name != INDEX_NAME)
+        stats = {}
+
+        for name in names:
+            info = stat(self._path(name))
+            stats[name] = [info.st_mtime_ns, info.st_size]
+
+        return stats
+
+
+    def refresh(self) -> bool:
+        '''Reindex if a pack was added, removed or changed since the index was read,
+        so a long running process sees edits. Costs a stat per pack when nothing has changed.
+        Returns True if it reindexed
+
+        RAISES
+        OSError: the folder can't be read'''
+
+        stats = self._stats()
+        known = {name : pack["stat"] for name, pack in self.packs.items()}
+        known.update(self.broken)
+
+        if stats == known:
+            return False
+
+        #packs that haven't changed don't need reading again
+        self._loaded = {name : pack for name, pack in self._loaded.items()
+            if name in self.packs and self.packs[name]["stat"] == stats.get(name)}
+        self.packs = {}
+        self.broken = {}
+
+        self._readIndex()
+        return True
+
+
+    def _mapAliases(self):
+        '''Work out which pack each alias is in from packs'''
+
+        self._aliases = {}
+        for name, pack in self.packs.items():
+            #the first pack (by name) to claim an alias wins
+            for alias in pack["aliases"]:
+                self._aliases.setdefault(alias, name)
+
+        self._trie = None
+        self._fuzzy = None
+
+
+    def _skip(self, name: str, error: Exception):
+        '''Warn that the pack name can't be read and stop using it'''
+
+        try:
+            info = stat(self._path(name))
+            self.broken[name] = [info.st_mtime_ns, info.st_size]
+
+        except OSError:
+            self.broken[name] = None  #gone, so refresh sees it as changed
+        print(f"Skipping skills pack {name}, it is in the wrong format or can't be read: {error}", file = stderr)
+
+        #a pack that broke after the index was read takes its aliases with it
+        if self.packs.pop(name, None) is not None:
+            self._mapAliases()
+
+
+    def _writeIndex(self):
+        '''Save the index, writing to a temporary file first so a crash can't leave half an index'''
+
+        temporary = self._path(INDEX_NAME + ".tmp")
+        try:
+            with open(temporary, "w", encoding = "utf-8") as f:
+                dump({"version" : INDEX_VERSION, "packs" : self.packs}, f)
+
+            replace(temporary, self._path(INDEX_NAME))
+
+        except OSError:
+            pass  #a read only folder still works, the index is just rebuilt each time
+
+
+    def _pack(self, alias: str) -> SkillIndex:
+        '''Return the SkillIndex of the pack alias is in, reading the pack if needed
+
+        RAISES
+        ValueError: alias is not in any pack'''
+
+        try:
+            name = self._aliases[alias]
+
+        except KeyError:
+            raise ValueError("Target not found") from None
+
+        try:
+            return self._loaded[name]
+
+        except KeyError:
+            pass
+
+        #the pack may have been edited since the index was read
+        try:
+            pack = self._loaded[name] = SkillIndex(readPack(self._path(name)))
+
+        except (OSError, ValueError) as error:
+            self._skip(name, error)
+            raise ValueError("Target not found") from None
+
+        return pack
+
+
+    def loadAll(self, parallel: bool = True, workers: Optional[int] = None) -> int:
+        '''Read every pack that hasn't been read yet and return how many were read.
+
+        parallel: (optional) parse the packs in a process pool. Defaults to True
+        workers: (optional) number of processes. Defaults to the number of CPUs'''
+
+        names = [name for name in self.packs if name not in self._loaded and name not in self.broken]
+
+        if parallel and len(names) > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers = workers) as pool:
+                futures = [pool.submit(readPack, self._path(name)) for name in names]
+
+        else:
+            futures = None
+
+        read = 0
+        for number, name in enumerate(names):
+            skills = None
+
+            if futures is not None:
+                try:
+                    skills = futures[number].result()
+
+                except (OSError, ValueError) as error:
+                    self._skip(name, error)
+                    continue
+
+                except Exception:
+                    pass  #the worker failed rather than the pack, such as a broken pool, so it is read here instead
+
+            if skills is None:
+                try:
+                    skills = readPack(self._path(name))
+
+                except (OSError, ValueError) as error:
+                    self._skip(name, error)
+                    continue
+
+            self._loaded[name] = SkillIndex(skills)
+            read += 1
+
+        return read
+
+
+    def get(self, alias: str) -> str:
+        '''Return the info for alias
+
+        RAISES
+        ValueError: alias is not in any pack'''
+
+        return self._pack(alias).get(alias)
+
+
+    def keyOf(self, alias: str) -> Tuple[str,]:
+        '''Return the key of the entry that alias belongs to
+
+        RAISES
+        ValueError: alias is not in any pack'''
+
+        return self._pack(alias).keyOf(alias)
+
+
+    def info(self, key: Tuple[str,]) -> str:
+        '''Return the info of the entry with key, such as one from search
+
+        RAISES
+        KeyError: no entry has that key'''
+
+        for alias in key:
+            try:
+                pack = self._pack(alias)
+
+            except ValueError:
+                continue
+
+            if key in pack.skills:
+                return pack.info(key)
+
+        raise KeyError(key)
+
+
+    def startsWith(self, prefix: str) -> List[str]:
+        '''Return every alias beginning with prefix in alphabetical order. No packs are read'''
+
+        if self._trie is None:
+            self._trie = AliasTrie(self._aliases)
+
+        return self._trie.startsWith(prefix)
+
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Tuple[str,], float]]:
+        '''Full text search of every pack. Returns up to limit (key, score) pairs, best first.
+        Reads every pack the first time it is called.
+        Scores come from each pack's own index so are only roughly comparable between packs'''
+
+        self.loadAll()
+
+        results = []
+        for pack in self._loaded.values():
+            results.extend(pack.search(query, limit))
+
+        results.sort(key = lambda result: result[1], reverse = True)
+        return results[:limit]
+
+
+    def suggest(self, alias: str) -> Optional[Tuple[str, int]]:
+        '''Return (alias, edit distance) for the alias closest to a misspelt one,
+        or None if nothing is close enough. No packs are read'''
+
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyMatcher(self._aliases)
+
+        return self._fuzzy.best(alias)
+
+
+    def aliases(self) -> List[str]:
+        '''Return every alias in every pack'''
+
+        return list(self._aliases)
+
+
+    def items(self) -> Iterator[Tuple[Tuple[str,], str]]:
+        '''Iterate over (key, info) pairs, pack by pack. Reads every pack'''
+
+        self.loadAll()
+
+        for name in self.packs:
+            yield from self._loaded[name].items()
+
+
+    def __contains__(self, alias: str) -> bool:
+        return alias in self._aliases
+
+
+    def __len__(self) -> int:
+        return sum(pack["count"] for pack in self.packs.values())
@@ -0,0 +1,218 @@
+'''SQLite backed storage for the skills, for banks shared between subjects and teachers.
+Has the same lookup methods as SkillIndex so either can be searched'''
+
+import sqlite3
+from typing import Dict, Tuple, List, Iterator, Optional, Union
+from Modules.SkillIndex import FuzzyMatcher, tokenize
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    info TEXT NOT NULL,
+    subject TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    skill INTEGER NOT NULL REFERENCES skills(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS aliasesBySkill ON aliases(skill);
+'''
+
+_FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS skillsText USING fts5(key, info, content = 'skills', content_rowid = 'id');
+'''
+
+class SkillStore:
+    '''Skills kept in an SQLite database.
+
+    ATTRIBUTES
+    path: string file path of the database.
+    hasFts: boolean for whether SQLite has FTS5. Without it, search falls back to LIKE.
+    _connection: the sqlite3 connection.
+    _fuzzy: FuzzyMatcher of every alias. Built on the first suggestion and dropped on import.
+    '''
+
+    def __init__(self, path: str = "skills.db"):
+        '''path: the database to open. It is created if it doesn't exist
+
+        RAISES
+        sqlite3.Error: the database can't be opened'''
+
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._fuzzy = None
+
+        try:
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.executescript(_SCHEMA)
+
+        except sqlite3.Error:
+            self._connection.close()
+            raise
+
+        try:
+            self._connection.executescript(_FTS_SCHEMA)
+            self.hasFts = True
+
+        except sqlite3.OperationalError:  #SQLite was built without FTS5
+            self.hasFts = False
+
+
+    def importSkills(self, skills: Dict[Union[str, Tuple[str,]], str], subject: str = "", replace: bool = False) -> int:
+        '''Add skills to the store in a single transaction and return how many were added.
+        Existing skills with the same key have their info updated,
+        and aliases move to the skill that now claims them.
+
+        skills: dict of aliases : info. Keys can be "alias, alias" strings like
+        dumpToSkills.toSend or tuples like getJson returns.
+        subject: (optional) the subject the skills are for.
+        replace: (optional) delete the skills of subject that aren't in skills,
+        so that the subject matches the file it was imported from. Defaults to False'''
+
+        rows = []
+        claimed = {}
+        for key, info in skills.items():
+            if not isinstance(key, str):
+                key = ", ".join(key)
+
+            rows.append((key, info, subject))
+
+            #the first skill to claim an alias wins, like SkillIndex
+            for alias in key.split(", "):
+                claimed.setdefault(alias, key)
+
+        #the connection as a context manager commits at the end, or rolls back on an error
+        with self._connection as connection:
+            if replace:
+                keys = {key for key, *_ in rows}
+                removed = [(key, ) for key, in connection.execute("SELECT key FROM skills WHERE subject = ?", (subject, ))
+                    if key not in keys]
+
+                #their aliases are deleted with them
+                connection.executemany("DELETE FROM skills WHERE key = ?", removed)
+
+            connection.executemany('''INSERT INTO skills (key, info, subject) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET info = excluded.info, subject = excluded.subject''', rows)
+
+            connection.executemany('''INSERT INTO aliases (alias, skill)
+                SELECT ?, id FROM skills WHERE key = ?
+                ON CONFLICT(alias) DO UPDATE SET skill = excluded.skill''', claimed.items())
+
+            if self.hasFts:
+                connection.execute("INSERT INTO skillsText(skillsText) VALUES ('rebuild')")
+
+        self._fuzzy = None
+        return len(rows)
+
+
+    def get(self, alias: str) -> str:
+        '''Return the info for alias
+
+        RAISES
+        ValueError: alias is not in the store'''
+
+        row = self._connection.execute('''SELECT info FROM aliases JOIN skills ON skills.id = aliases.skill
+            WHERE alias = ?''', (alias, )).fetchone()
+
+        if row is None:
+            raise ValueError("Target not found")
+
+        return row[0]
+
+
+    def keyOf(self, alias: str) -> Tuple[str,]:
+        '''Return the key of the entry that alias belongs to
+
+        RAISES
+        ValueError: alias is not in the store'''
+
+        row = self._connection.execute('''SELECT key FROM aliases JOIN skills ON skills.id = aliases.skill
+            WHERE alias = ?''', (alias, )).fetchone()
+
+        if row is None:
+            raise ValueError("Target not found")
+
+        return tuple(row[0].split(", "))
+
+
+    def info(self, key: Tuple[str,]) -> str:
+        '''Return the info of the entry with key, such as one from search
+
+        RAISES
+        KeyError: no entry has that key'''
+
+        row = self._connection.execute("SELECT info FROM skills WHERE key = ?", (", ".join(key), )).fetchone()
+        if row is None:
+            raise KeyError(key)
+
+        return row[0]
+
+
+    def startsWith(self, prefix: str) -> List[str]:
+        '''Return every alias beginning with prefix in alphabetical order.
+        Uses a range over the alias index instead of LIKE so the index is always used'''
+
+        rows = self._connection.execute("SELECT alias FROM aliases WHERE alias >= ? AND alias < ? ORDER BY alias",
+            (prefix, prefix + "\U0010ffff"))
+
+        return [alias for alias, in rows]
+
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Tuple[str,], float]]:
+        '''Full text search of the skills. Returns up to limit (key, score) pairs, best first'''
+
+        words = tokenize(query)
+        if not words:
+            return []
+
+        if self.hasFts:
+            #quote each word so that FTS5 doesn't read them as operators
+            match = " OR ".join(f'"{word}"' for word in words)
+            rows = self._connection.execute('''SELECT key, -bm25(skillsText) FROM skillsText
+                WHERE skillsText MATCH ? ORDER BY rank LIMIT ?''', (match, limit))
+
+        else:
+            #score by the number of query words in the info
+            score = " + ".join(["(info LIKE ?)"] * len(words))
+            patterns = [f"%{word}%" for word in words]
+            rows = self._connection.execute(f'''SELECT key, {score} AS score FROM skills
+                WHERE score > 0 ORDER BY score DESC LIMIT ?''', patterns + [limit])
+
+        return [(tuple(key.split(", ")), score) for key, score in rows]
+
+
+    def suggest(self, alias: str) -> Optional[Tuple[str, int]]:
+        '''Return (alias, edit distance) for the alias closest to a misspelt one,
+        or None if nothing is close enough'''
+
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyMatcher(self.aliases())
+
+        return self._fuzzy.best(alias)
+
+
+    def aliases(self) -> List[str]:
+        '''Return every alias in the store'''
+
+        return [alias for alias, in self._connection.execute("SELECT alias FROM aliases")]
+
+
+    def items(self) -> Iterator[Tuple[Tuple[str,], str]]:
+        '''Iterate over (key, info) pairs in the order they were added'''
+
+        for key, info in self._connection.execute("SELECT key, info FROM skills ORDER BY id"):
+            yield (tuple(key.split(", ")), info)
+
+
+    def close(self):
+        '''Close the database'''
+        self._connection.close()
+
+
+    def __contains__(self, alias: str) -> bool:
+        return self._connection.execute("SELECT 1 FROM aliases WHERE alias = ?", (alias, )).fetchone() is not None
+
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
@@ -1,38 +1,41 @@
 '''This module contains all of the custom Widget/window classes'''
 
-from tkinter import Tk, Button, IntVar, StringVar, DoubleVar, BooleanVar, Entry, Label, Widget, Toplevel, Frame, Message
-from typing import Tuple, Callable, Union, List
+from tkinter import Tk, Button, IntVar, StringVar, DoubleVar, BooleanVar, Entry, Label, Widget, Toplevel, Frame, Message, Scrollbar, TclError
+from typing import Tuple, Callable, Union, List, Dict, Sequence, Any, Optional
 from Modules.MyUtils import WidgetFactory
 from sys import exc_info
+from collections import deque
+import tkinter
 import traceback
 
 class Popup:
     '''Popup class intended to be used for errors,
-   but flexible enough to be used for any popup
+   but flexible enough to be used for any popup.
+   Popups are shown by a PopupManager, which reuses a few windows instead of making a Tk per popup.
+   A popup with the same title and text as one already waiting or showing is merged into it.
    
    ATTRIBUTES
-   instances: dict of the currently alive instances.
-
-   _population: integer for tracking current number of instances and auto-triggering culling.
-   Popups are culled every 2 open popups. If modified: the user must clean up the instances attr accordingly.
-   _name: string to describe the purpose of the popup. Composite key of name+population.
-   _window: the root window of the popup.
-   _errorBackground: all widgets are placed on this. Destroy it to clear the popup.
-   _message: Message widget that contains the input text.
-   _dieButton: Button to close the widget.
+   instances: dict of the popups that are showing or waiting to be shown.
+
+   text: string message.
+   title: string window title.
+   commands: list of functions to call when the popup is dismissed.
+   repeats: integer for how many identical popups were merged into this one.
+   original: the popup this one was merged into, or None.
+   manager: the PopupManager showing the popup.
+   _name: string to describe the purpose of the popup. Composite key of name+count.
+   _slot: the PopupSlot showing the popup, or None if it is waiting or closed.
    '''
 
     #attributes
-    _population=0
+    _count=0
     instances={}
 
     def __init__(self, text: str="Something went wrong",\
-       title: str="Error!", name: str=None):
+       title: str="Error!", name: str=None, command: Callable=None, root: Tk=None):
         '''Builds a custom popup
 
         ARGUMENTS:
-        factory: used to build the widgets
-
         text: (optional) the text for the message.
         Defaults to 'Something went wrong.'
 
@@ -41,72 +44,431 @@ class Popup:
 
         name: the name of the instance. Used to reference the instance
         from the instances attribute and should describe the instance of the popup.
-        The current population will be appended to the attribute to ensure it's unique.
-        Defaults to the title plus the current population.
+        A count will be appended to the attribute to ensure it's unique.
+        Defaults to the title plus the count.
+
+        command: (optional) function to call when the popup is dismissed.
+        Replaces closing the popup. E.G: command=lambda: exit(0)
+
+        root: (optional) the window the popup belongs to. Defaults to the main window.
+        A hidden one is made if there isn't one yet.
         '''
 
-        #culling the population if too many popups are active
-        if self._population>=2:
-            for name, instance in reversed(list(self.instances.items())):
-                instance._window.destroy()
-                del Popup.instances[name]
-                Popup._population-=1
+        self.text=text
+        self.title=title
+        self.commands=[command] if command is not None else []
+        self.repeats=0
+        self.original=None
+        self._slot=None
+
+        Popup._count+=1
+        if name is not None:
+            self._name=f"{name}{self._count}"  #count appended to ensure it's unique
+
+        else:
+            self._name=f"{title}{self._count}"
+
+        self.manager=PopupManager.forRoot(root)
+        self.manager.post(self)
+
+
+    @property
+    def _window(self) -> Union[Tk, Toplevel]:
+        '''The window the popup is shown in, or the root if it is waiting'''
+
+        if self.original is not None:
+            return self.original._window
+
+        return self._slot.window if self._slot is not None else self.manager.root
+
+
+    def mainloop(self):
+        '''Run the event loop of the popup's root. Needed when there is no other window'''
+
+        self.manager.root.mainloop()
+
+
+    def dismiss(self):
+        '''Called by the OK button. Runs the commands then closes the popup'''
+
+        for command in list(self.commands):
+            command()
+
+        self.close()
+
+
+    def close(self):
+        '''Hide the popup and show the next waiting one'''
+
+        if self.original is not None:
+            return self.original.close()
+
+        self.manager.release(self)
+
+
+class PopupSlot:
+    '''One reusable popup window.
+
+    ATTRIBUTES
+    window: the Toplevel. It is withdrawn rather than destroyed when the popup closes.
+    popup: the Popup being shown, or None.
+    _errorBackground: sizes the window.
+    _message: Message widget that contains the text.
+    _dieButton: Button to dismiss the popup.
+    '''
+
+    def __init__(self, root: Tk):
+        '''root: the window the slot belongs to'''
+
+        self.popup=None
 
         #create window
-        self._window=Tk()
-        self._window.protocol("WM_DELETE_WINDOW", self.close)  #close is called when the window is closed by user
-        self._window.title(title)
+        self.window=Toplevel(root)
+        self.window.withdraw()
+        self.window.protocol("WM_DELETE_WINDOW", self._dismiss)  #treated as OK when closed by the user
 
         #create background
-        self._errorBackground=Frame(self._window, height=200, width=200)
+        self._errorBackground=Frame(self.window, height=200, width=200)
         self._errorBackground.grid(row=0, column=0)
 
         #create message
-        self._message=Message(text=text, master=self._window, fg="red", width=120)
+        self._message=Message(text="", master=self.window, fg="red", width=120)
         self._message.place(x =100, y=75, anchor="center")
 
         #create dismiss button
-        self._dieButton=Button(text="OK", command=self.close, master=self._window)
+        self._dieButton=Button(text="OK", command=self._dismiss, master=self.window)
         self._dieButton.place(x=100, y=125, anchor="center")
 
-        #update population
-        Popup._population+=1
-        if name is not None:
-            self._name=f"{name}{self._population}"  #population appended to ensure it's unique
 
-        else:
-            self._name=f"{title}{self._population}"
+    def show(self, popup: Popup):
+        '''Show popup in this window'''
 
-        Popup.instances[self._name]=self
+        self.popup=popup
+        popup._slot=self
 
+        self.window.title(popup.title)
+        self.update()
+        self.window.deiconify()
+        self.window.lift()
 
-    def close(self):
-        '''Kills the window and cleans up the class data'''
+
+    def update(self):
+        '''Redraw the text, such as after more popups were merged into this one'''
+
+        text=self.popup.text
+        if self.popup.repeats:
+            text=f"{text}\n(repeated {self.popup.repeats} more time{'s' if self.popup.repeats!=1 else ''})"
+
+        self._message.config(text=text)
+
+
+    def hide(self):
+        '''Withdraw the window so that it can be reused'''
+
+        self.popup._slot=None
+        self.popup=None
+        self.window.withdraw()
+
+
+    def exists(self) -> bool:
+        try:
+            return bool(self.window.winfo_exists())
+
+        except TclError:  #the root was destroyed
+            return False
+
+
+    def _dismiss(self):
+        if self.popup is not None:
+            self.popup.dismiss()
+
+
+class PopupManager:
+    '''Shows popups in a small pool of Toplevels under one root window.
+    Popups past the pool size wait in a queue and are shown as others close.
+    Popups with the same title and text as one that is showing or waiting are merged into it,
+    so a burst of the same error is one popup that says how many times it happened.
+
+    ATTRIBUTES
+    managers: dict of root window : its PopupManager.
+
+    root: the Tk root the windows belong to.
+    slots: list of the PopupSlots made so far. At most POOL_SIZE.
+    waiting: deque of the popups waiting for a slot.
+    suppressed: integer for how many popups were merged or dropped instead of shown.
+    _live: dict of (title, text) : the popup showing or waiting with it.
+    '''
+
+    #popups shown at once
+    POOL_SIZE=2
+
+    #popups that can wait at once. Any more are dropped and counted as suppressed
+    QUEUE_LIMIT=20
+
+    managers={}
+
+    @classmethod
+    def forRoot(cls, root: Tk=None) -> "PopupManager":
+        '''Return the manager for root, making it if needed.
+        Without a root the main window is used, or a hidden one if there isn't one yet'''
+
+        if root is None:
+            root=tkinter._default_root
+
+            if root is None:
+                root=Tk()
+                root.withdraw()
+
+        manager=cls.managers.get(root)
 
         try:
-            del Popup.instances[self._name]
+            if manager is not None and root.winfo_exists():
+                return manager
 
-        except KeyError:
-            #KeyError would mean that __init__ failed before the end
-            #perhaps add a status attribute
-            #and log death circumstances instead of silencing this
+        except TclError:  #the root was destroyed
             pass
-            
+
+        manager=cls.managers[root]=cls(root)
+        return manager
+
+
+    def __init__(self, root: Tk):
+        '''root: the root window. Use forRoot instead of calling this directly'''
+
+        self.root=root
+        self.slots=[]
+        self.waiting=deque()
+        self.suppressed=0
+        self._live={}
+
+
+    def post(self, popup: Popup):
+        '''Show popup, merge it into an identical one, or queue it if every slot is busy'''
+
+        key=(popup.title, popup.text)
+        original=self._live.get(key)
+
+        if original is not None:
+            original.repeats+=1
+            original.commands.extend(popup.commands)
+            popup.original=original
+            self.suppressed+=1
+
+            if original._slot is not None:
+                original._slot.update()
+
+            return
+
+        slot=self._freeSlot()
+        if slot is not None:
+            slot.show(popup)
+
+        elif len(self.waiting)<self.QUEUE_LIMIT:
+            self.waiting.append(popup)
+
+        else:
+            self.suppressed+=1
+            return
+
+        self._live[key]=popup
+        Popup.instances[popup._name]=popup
+
+
+    def release(self, popup: Popup):
+        '''Close popup and give its slot to the next waiting popup'''
+
+        Popup.instances.pop(popup._name, None)
+        if self._live.get((popup.title, popup.text)) is popup:
+            del self._live[(popup.title, popup.text)]
+
+        slot=popup._slot
+        if slot is None:
+            #closed before it was shown
+            try:
+                self.waiting.remove(popup)
+
+            except ValueError:
+                pass
+
+            return
+
+        try:
+            slot.hide()
+
+        except TclError:
+            traceback.print_exc()
+            self.slots.remove(slot)
+            slot=self._freeSlot()
+
+        if self.waiting and slot is not None:
+            slot.show(self.waiting.popleft())
+
+
+    def _freeSlot(self) -> Optional[PopupSlot]:
+        '''Return an idle slot, making one if the pool isn't full, or None if every slot is busy'''
+
+        #forget windows that were destroyed along with their root
+        self.slots=[slot for slot in self.slots if slot.popup is not None or slot.exists()]
+
+        for slot in self.slots:
+            if slot.popup is None:
+                return slot
+
+        if len(self.slots)<self.POOL_SIZE:
+            slot=PopupSlot(self.root)
+            self.slots.append(slot)
+            return slot
+
+        return None
+
+
+class TooltipEngine:
+    '''One tooltip window shared by every ToolTip under a root window.
+    The window is shown after a delay, and mouse movement moves it at most once a frame.
+
+    ATTRIBUTES
+    engines: dict of root window : its TooltipEngine.
+
+    root: the Tk root the window belongs to.
+    window: the shared Toplevel.
+    label: the widget that displays the text.
+    owner: the ToolTip being shown or waiting to be shown, or None.
+    visible: boolean for whether the window is showing.
+    _position: tuple of the latest (x, y) screen position of the cursor.
+    _showJob: id of the delayed show, or None.
+    _moveJob: id of the next move, or None.
+    '''
+
+    #milliseconds to hover before the tip appears
+    DELAY = 400
+
+    #milliseconds between moves. About one frame at 60 FPS
+    FRAME = 16
+
+    engines = {}
+
+    @classmethod
+    def forWidget(cls, widget: Widget) -> "TooltipEngine":
+        '''Return the engine for widget's root window, making it if needed'''
+
+        root = widget._root()
+        engine = cls.engines.get(root)
+
         try:
-            self._window.destroy()
+            if engine is not None and engine.window.winfo_exists():
+                return engine
+
+        except TclError:  #the root was destroyed
+            pass
+
+        engine = cls.engines[root] = cls(root)
+        return engine
+
+
+    def __init__(self, root: Tk):
+        '''root: the root window. Use forWidget instead of calling this directly'''
+
+        self.root = root
+        self.window = Toplevel(root)
+
+        #hide the toplevel immediately and remove its border + exit buttons
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+
+        self.label = Label(master = self.window, text = "")
+        self.label.pack()
+
+        self.owner = None
+        self.visible = False
+        self._position = (0, 0)
+        self._showJob = None
+        self._moveJob = None
+
+
+    def enter(self, tip: "ToolTip", event = None):
+        '''Start showing tip after the delay'''
+
+        self.leave(self.owner)
+        self.owner = tip
+        self._track(event)
+        self.label.config(text = tip.currentText())
 
-        except:
-            #will result in an infinite loop if this is caused by a code error
-            Popup(text="Unable to kill popup", title="Popup error!", name="Popup Error")
+        self._showJob = self.root.after(self.DELAY, self._show)
 
 
-class ToolTip(Toplevel):
+    def motion(self, tip: "ToolTip", event = None):
+        '''Follow the cursor. Moves are coalesced to one per frame'''
+
+        if tip is not self.owner:
+            return
+
+        self._track(event)
+
+        if self.visible and self._moveJob is None:
+            self._moveJob = self.root.after(self.FRAME, self._move)
+
+
+    def leave(self, tip: "ToolTip", event = None):
+        '''Hide tip if it is the one showing'''
+
+        if tip is None or tip is not self.owner:
+            return
+
+        for job in (self._showJob, self._moveJob):
+            if job is not None:
+                self.root.after_cancel(job)
+
+        self._showJob = self._moveJob = None
+        self.owner = None
+
+        if self.visible:
+            self.window.withdraw()
+            self.visible = False
+
+
+    def refresh(self, tip: "ToolTip"):
+        '''Recompute the text of tip if it is the one showing, such as after a state change'''
+
+        if tip is self.owner:
+            self.label.config(text = tip.currentText())
+
+
+    def _track(self, event):
+        if event is not None:
+            self._position = (event.x_root, event.y_root)
+
+        else:
+            self._position = self.root.winfo_pointerxy()
+
+
+    def _place(self):
+        #not exactly placed on cursor to avoid interferance
+        self.window.geometry(f"+{self._position[0] + 10}+{self._position[1] + 10}")
+
+
+    def _show(self):
+        self._showJob = None
+        self._place()
+        self.window.deiconify()
+        self.window.lift()
+        self.visible = True
+
+
+    def _move(self):
+        self._moveJob = None
+
+        if self.visible:
+            self._place()
+
+
+class ToolTip:
     '''Class to create tool tips when hovering over a widget.
     Supports grouping widgets under one ToolTip instance.
+    All ToolTips under a root share one window through TooltipEngine.
 
     ATTRIBUTES
     _widgets: list of parent widgets of the tooltip.
-    label: the widget that displays the text.
+    _engine: the TooltipEngine that shows the tip.
     text: the string text of the label. Does not change.
     getText: the function that returns the text for the label on each hover.
     Allows for dynamic text such as displaying current state.
@@ -140,52 +502,47 @@ class ToolTip(Toplevel):
                 if widget.master is not self._master:
                     raise ValueError("One or more widgets' masters are unequal")
 
-        #self becomes an instance of Toplevel
-        Toplevel.__init__(self, master=self._master)
-        
-        #hide the toplevel immediately and remove its border + exit buttons
-        self.withdraw()
-        self.overrideredirect(True)
-
-        if text is not None:
-            self.label=Label(master=self, text=text)
-            self.label.pack()
-            self.getText=None
-
-        else:
-            self.label=Label(master=self, text="")
-            self.label.pack()
-            self.getText=getText
+        self._engine=TooltipEngine.forWidget(self._master)
+        self.text=text
+        self.getText=getText if text is None else None
 
         for widget in self._widgets:
             widget.bind("<Enter>", self.display)
             widget.bind("<Motion>", self.goToWidget)
             widget.bind("<Leave>", self.die)
-        
 
-    def display(self, event=None):  #the context is taken in to silence it
-        '''Wrapper for Toplevel.deiconify to show the popup when needed.
-        Necessary because events pass a context object into the callback so
-        deiconify gets unexpected arguments'''
+
+    def currentText(self) -> str:
+        '''Return the text to show'''
 
         if self.getText is not None:
-            self.label.config(text=self.getText())
+            return self.getText()
 
-        self.deiconify()
+        return self.text
+
+
+    def display(self, event=None):  #the context is taken in to silence it
+        '''Show the tip after the engine's delay'''
+
+        self._engine.enter(self, event)
 
 
     def die(self, event=None):  #again the context must be silenced
-        '''Wrapper for Toplevel.withdraw to make the popup disappear.
-        Necessary due to the event object passed to an event's callback'''
+        '''Make the tip disappear'''
 
-        self.withdraw()
+        self._engine.leave(self, event)
 
 
     def goToWidget(self, event=None):
         '''Moves the tip to where the cursor is instead of the top left corner'''
 
-        self.geometry(f"+{event.x_root+10}+{event.y_root+10}")  #not exactly placed on cursor to avoid interferance
-        self.display()
+        self._engine.motion(self, event)
+
+
+    def refresh(self):
+        '''Recompute the text if the tip is showing. Call when whatever getText reads changes'''
+
+        self._engine.refresh(self)
 
 
 class ToggleButton():
@@ -310,6 +667,9 @@ class ToggleButton():
 
         self.button.config(fg=self.colours[index])
 
+        #the tooltip shows the state
+        self._tooltip.refresh()
+
 
     def popOutTextBox(self):
         if self.state:
@@ -324,12 +684,309 @@ class ToggleButton():
             for widget, *_ in self.popouts:
                 widget.place_forget()
 
+    def setState(self, state: bool):
+        '''Set the state without calling the commands.
+        Used when a button is reused for something else'''
+
+        if state != self.__state:
+            self.stateChange()
+
+
+    def setColours(self, colours: Tuple[str, str]):
+        '''Change the (off, on) fg colours and recolour the button to match its state'''
+
+        self.colours = colours
+        self.button.config(fg = self.colours[int(self.__state)])
+
     #getters
     @property
     def state(self):
         '''Getter for self.state'''
         return self.__state
 
+class SelectionGroup:
+    '''Radio button style group of ToggleButtons where at most one is on at a time.
+    The group remembers which button is on, so turning one on only has to turn off that one
+    instead of checking every button. A page can have as many groups as it needs.
+
+    ATTRIBUTES
+    active: the ToggleButton that is on, or None.
+    buttons: list of the buttons in the group, in order.
+    onChange: function called with the new active button (or None) whenever it changes.
+    _positions: dict of button : index in buttons. Used to find the next and previous buttons.
+    '''
+
+    def __init__(self, onChange: Callable[[Optional[ToggleButton]], None] = None):
+        '''onChange: (optional) function to call with the new active button (or None) when it changes'''
+
+        self.active = None
+        self.buttons = []
+        self.onChange = onChange
+        self._positions = {}
+
+
+    def add(self, button: ToggleButton) -> ToggleButton:
+        '''Add button to the group. Returns button so calls can be chained'''
+
+        self._positions[button] = len(self.buttons)
+        self.buttons.append(button)
+
+        #run straight after the state changes, before any popouts or other commands
+        button.commands.insert(1, lambda: self._toggled(button))
+        return button
+
+
+    def _toggled(self, button: ToggleButton):
+        '''Called when a button in the group is clicked'''
+
+        if button.state:
+            self.setActive(button)
+
+        elif self.active is button:
+            self.setActive(None)
+
+
+    def setActive(self, button: Optional[ToggleButton]):
+        '''Make button the active one (or have none if it's None) without calling its commands.
+        Only the previously active button is turned off'''
+
+        previous = self.active
+        self.active = button
+
+        if previous is not None and previous is not button:
+            previous.setState(False)
+
+        if button is not None:
+            button.setState(True)
+
+        if previous is not button and self.onChange is not None:
+            self.onChange(button)
+
+
+    def select(self, button: ToggleButton):
+        '''Turn button on as if it was clicked, running its commands'''
+
+        if not button.state:
+            button.callCommands()
+
+
+    def next(self):
+        '''Select the button after the active one, or the first if none is active'''
+
+        if self.buttons:
+            position = self._positions[self.active] + 1 if self.active is not None else 0
+            self.select(self.buttons[position % len(self.buttons)])
+
+
+    def previous(self):
+        '''Select the button before the active one, or the last if none is active'''
+
+        if self.buttons:
+            position = self._positions[self.active] - 1 if self.active is not None else -1
+            self.select(self.buttons[position % len(self.buttons)])
+
+
+    def bindKeys(self, widget: Widget, nextKey: str = "<Right>", previousKey: str = "<Left>"):
+        '''Move the selection with the keyboard while widget has focus'''
+
+        widget.bind(nextKey, lambda event: self.next())
+        widget.bind(previousKey, lambda event: self.previous())
+
+
+class ThemeEngine:
+    '''Keeps a registry of themed widgets so a new palette can be applied to them in place,
+    instead of rebuilding them with new colours.
+
+    A palette is a dict of role : colour, such as {"bg" : "#000000", "fg" : "#ffffff"}.
+    Widgets are registered with which of their options use which role.
+
+    ATTRIBUTES
+    palette: dict of the current role : colour.
+    _widgets: dict of widget : {option : role}.
+    _callbacks: dict of owner widget : list of functions to call with the palette.
+    For things that can't be done by setting an option, like ToggleButton colour pairs.
+    '''
+
+    def __init__(self, palette: Dict[str, str]):
+        '''palette: the palette the widgets are being built with'''
+
+        self.palette = dict(palette)
+        self._widgets = {}
+        self._callbacks = {}
+
+
+    def register(self, widget: Widget, **roles: str) -> Widget:
+        '''Theme widget's options with the palette roles given as option = role.
+        The current palette is applied straight away. Returns widget so calls can be chained.
+
+        E.G: theme.register(Label(master), fg = "fg", bg = "bg")'''
+
+        self._widgets.setdefault(widget, {}).update(roles)
+        widget.configure(**{option : self.palette[role] for option, role in roles.items()})
+        return widget
+
+
+    def registerCallback(self, owner: Widget, callback: Callable[[Dict[str, str]], None]):
+        '''Call callback with the palette whenever it changes, until owner is destroyed'''
+
+        self._callbacks.setdefault(owner, []).append(callback)
+
+
+    def forget(self, parent: Widget):
+        '''Stop theming parent and every widget inside it. Call before destroying them'''
+
+        path = str(parent)
+        inside = lambda widget: str(widget) == path or str(widget).startswith(path + ".")
+
+        self._widgets = {widget : roles for widget, roles in self._widgets.items() if not inside(widget)}
+        self._callbacks = {owner : callbacks for owner, callbacks in self._callbacks.items() if not inside(owner)}
+
+
+    def apply(self, palette: Dict[str, str]):
+        '''Recolour every registered widget with palette in one pass.
+        Widgets that have been destroyed are dropped from the registry'''
+
+        self.palette = dict(palette)
+        dead = []
+
+        for widget, roles in self._widgets.items():
+            try:
+                widget.configure(**{option : self.palette[role] for option, role in roles.items()})
+
+            except TclError:
+                dead.append(widget)
+
+        for owner, callbacks in self._callbacks.items():
+            try:
+                for callback in callbacks:
+                    callback(self.palette)
+
+            except TclError:
+                dead.append(owner)
+
+        for widget in dead:
+            self._widgets.pop(widget, None)
+            self._callbacks.pop(widget, None)
+
+
+class VirtualGrid(Frame):
+    '''Scrollable grid that only has widgets for the rows on screen.
+    Scrolling reuses the same cells for different items, so it costs the same
+    for a handful of items or thousands.
+
+    ATTRIBUTES
+    items: sequence of the items to show. Replace it with setItems.
+    columns: integer number of cells per row.
+    rows: integer number of rows on screen.
+    firstRow: integer index of the top row on screen.
+    cells: list of the cells, in row order.
+    _showCell: function that puts an item (or None for no item) in a cell.
+    body: Frame holding the cells.
+    _scrollbar: the Scrollbar on the right.
+    '''
+
+    def __init__(self, master: Widget, items: Sequence[Any], makeCell: Callable[[Frame, int, int], Any],
+       showCell: Callable[[Any, Any], None], columns: int = 3, rows: int = 2, **kwargs):
+        '''ARGUMENTS
+        master: the widget to put the grid in.
+        items: sequence of the items to show.
+        makeCell: function taking (master, row, column) that creates and grids a cell and returns it.
+        Only called columns * rows times.
+        showCell: function taking (cell, item) that updates a cell to show item.
+        item is None when there is nothing to show in the cell.
+        columns: (optional) number of cells per row. Defaults to 3
+        rows: (optional) number of rows on screen. Defaults to 2
+        **kwargs: extra settings for the Frame, such as bg'''
+
+        Frame.__init__(self, master, **kwargs)
+
+        self.columns = columns
+        self.rows = rows
+        self.firstRow = 0
+        self._showCell = showCell
+
+        self.body = Frame(self, **kwargs)
+        self.body.grid(row = 0, column = 0)
+
+        self._scrollbar = Scrollbar(self, orient = "vertical", command = self.scroll)
+        self._scrollbar.grid(row = 0, column = 1, sticky = "ns")
+
+        self.cells = [makeCell(self.body, row, column) for row in range(rows) for column in range(columns)]
+
+        for widget in (self, self.body):
+            widget.bind("<MouseWheel>", self._wheel)
+            widget.bind("<Button-4>", self._wheel)
+            widget.bind("<Button-5>", self._wheel)
+
+        self.setItems(items)
+
+
+    def bindWheel(self, widget: Widget):
+        '''Let widget scroll the grid with the mouse wheel. Use on the widgets of each cell'''
+
+        widget.bind("<MouseWheel>", self._wheel, add = "+")
+        widget.bind("<Button-4>", self._wheel, add = "+")
+        widget.bind("<Button-5>", self._wheel, add = "+")
+
+
+    @property
+    def rowCount(self) -> int:
+        '''Number of rows needed to show every item'''
+        return -(-len(self.items) // self.columns)
+
+
+    def setItems(self, items: Sequence[Any]):
+        '''Show a different sequence of items, keeping the scroll position if it still fits'''
+
+        self.items = items
+        self.scrollTo(self.firstRow)
+
+
+    def scrollTo(self, row: int):
+        '''Make row the top row on screen and refill the cells'''
+
+        self.firstRow = max(0, min(row, self.rowCount - self.rows))
+
+        start = self.firstRow * self.columns
+        for offset, cell in enumerate(self.cells):
+            index = start + offset
+            self._showCell(cell, self.items[index] if index < len(self.items) else None)
+
+        if self.rowCount:
+            self._scrollbar.set(self.firstRow / self.rowCount, min(1.0, (self.firstRow + self.rows) / self.rowCount))
+
+        else:
+            self._scrollbar.set(0, 1)
+
+
+    def refresh(self):
+        '''Refill the cells, such as after the items have changed in place'''
+
+        self.scrollTo(self.firstRow)
+
+
+    def scroll(self, action: str, amount: str, unit: str = None):
+        '''Scrollbar command. Handles ("moveto", fraction) and ("scroll", count, "units" or "pages")'''
+
+        if action == "moveto":
+            self.scrollTo(round(float(amount) * self.rowCount))
+
+        elif unit == "pages":
+            self.scrollTo(self.firstRow + int(amount) * self.rows)
+
+        else:
+            self.scrollTo(self.firstRow + int(amount))
+
+
+    def _wheel(self, event):
+        #Linux sends buttons 4 and 5, Windows and Mac send a delta
+        if event.num == 4 or event.delta > 0:
+            self.scrollTo(self.firstRow - 1)
+
+        else:
+            self.scrollTo(self.firstRow + 1)
+
+
 class DimensionGetter():
     '''Prints the dimensions of the master on click. Developer tool'''
 
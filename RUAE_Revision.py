@@ -1,46 +1,365 @@
 '''Command line version of the app'''
 
-from json import load, decoder
-from typing import Tuple, Dict
-from sys import exit
-from Modules.Widgets import Popup
+from collections.abc import Mapping
+from json import loads, dumps, decoder
+from typing import Tuple, Dict, List, Union, Optional, Iterable, TextIO, Any, TYPE_CHECKING
+from sys import exit, stderr, stdin, stdout, argv
+from os import stat
+from os.path import isdir, exists
+from Modules.SkillIndex import SkillIndex, FuzzyMatcher
+from Modules.FileCache import FileCache
+from Modules.SkillPack import SkillPack
+from Modules.LazySkills import LazySkills
+
+#tkinter, sqlite3 and multiprocessing are slow to import and most runs don't need them,
+#so they are imported where they are used
+if TYPE_CHECKING:
+    from Modules.SkillStore import SkillStore
+    from Modules.SkillShards import ShardedSkills
+    from Modules.LookupServer import LookupClient
+
+#skills files at least this many bytes are decoded lazily
+LAZY_SIZE = 1 << 20
+
+#batch results are written this many at a time
+BATCH_CHUNK = 1024
+
+#where --daemon listens for lookups
+DAEMON_SOCKET = "ruae.sock"
+
+def parseSkills(contents: bytes) -> Dict[Tuple[str,], str]:
+    '''Turn the text of a skills file into a dict of (alias, alias) : info.
+    Big files give a LazySkills instead, which only decodes the info that gets used
+
+    RAISES
+    json.decoder.JSONDecodeError: the file is in the wrong format'''
+
+    if len(contents) >= LAZY_SIZE:
+        return LazySkills(contents)
+
+    #convert keys back to list
+    return {tuple(key.split(", ")) : value for key, value in dict(loads(contents)).items()}
+
+
+#parsed once per process and only reparsed when the file changes
+skillsCache = FileCache("skills.json", parseSkills)
+_index = None
+_store = None
+_storeStat = None
+_shards = None
+
 
 def getJson()-> Dict[Tuple[str,], str]:
-    #get file
-    with open("skills.json") as f:
+    '''Return the skills file as a dict of (alias, alias) : info.
+    The result is cached and shared, so don't edit it'''
+
+    try:
+        return skillsCache.get()
+
+    except decoder.JSONDecodeError:
+        showError("Skills Error", "Skills file is in the wrong format")
+
+
+def showError(title: str, text: str):
+    '''Tell the user about an error the app can't carry on from, then exit.
+    Uses a popup if a window can be made, otherwise prints it to the terminal'''
+
+    try:
+        from tkinter import TclError
+        from Modules.Widgets import Popup
+
+    except ImportError:  #Python without tkinter
+        Popup = None
+
+    if Popup is not None:
         try:
-            json = load(f)
-            #convert keys back to list
-            return {tuple(key.split(", ")) : value for key, value in dict(json).items()}
+            error = Popup(title = title, text = text, command = lambda: exit(0))
+            error.mainloop()
+            return
+
+        except TclError:  #no display to show it on
+            pass
+
+    print(f"{title}: {text}", file = stderr)
+    exit(1)
+
+
+def getIndex() -> SkillIndex:
+    '''Return a SkillIndex of the skills file.
+    It is only rebuilt when the file has changed since the last call'''
+
+    return indexOf(getJson())
+
+
+def indexOf(skills: Dict[Tuple[str,], str]) -> SkillIndex:
+    '''Return a SkillIndex of skills from getJson or skillsCache.
+    The last one is reused if skills hasn't changed'''
+
+    global _index
+
+    if _index is None or _index.skills is not skills:
+        _index = SkillIndex(skills)
+
+    return _index
+
+
+def getPack(path: str = "skills.pack") -> Optional[SkillPack]:
+    '''Return the compiled skills pack made by dumpToSkills.py --pack.
+    Returns None if there isn't one or if skills.json has been edited since it was made'''
+
+    try:
+        packTime = stat(path).st_mtime_ns
+
+    except OSError:
+        return None
+
+    try:
+        if stat("skills.json").st_mtime_ns > packTime:
+            return None
+
+    except OSError:
+        pass  #the pack is all there is
+
+    try:
+        return SkillPack(path)
+
+    except (OSError, ValueError):
+        return None
+
+
+def getStore(path: str = "skills.db") -> Optional["SkillStore"]:
+    '''Return the skills database made by migrateToSqlite.py or dumpToSkills.py --sqlite.
+    Returns None if there isn't one, if it can't be opened, or if skills.json has been edited since it was last written.
+    Both are checked on every call, so long running processes such as --daemon see edits'''
+
+    global _store, _storeStat
+
+    try:
+        info = stat(path)
+
+    except OSError:
+        return None
+
+    try:
+        if stat("skills.json").st_mtime_ns > info.st_mtime_ns:
+            return None
+
+    except OSError:
+        pass  #the database is all there is
+
+    #reopened if it has been written or replaced, so nothing cached from the old one is used.
+    #A database that couldn't be opened stays None until it changes
+    storeStat = (path, info.st_mtime_ns, info.st_ino)
+    if _storeStat == storeStat:
+        return _store
+
+    from Modules.SkillStore import SkillStore
+    import sqlite3
+
+    if _store is not None:
+        _store.close()
+
+    _storeStat = storeStat
+
+    try:
+        _store = SkillStore(path)
+
+    except sqlite3.Error as error:
+        print(f"Skipping {path}, it can't be opened as a skills database: {error}", file = stderr)
+        _store = None
+
+    return _store
+
+
+def getShards(folder: str = "skills") -> Optional["ShardedSkills"]:
+    '''Return the folder of per subject skills files, or None if there isn't one.
+    Only the folder's index is read until an alias from a pack is looked up.
+    The packs are restatted on every call, so long running processes such as --daemon see edits'''
+
+    global _shards
+
+    if not isdir(folder):
+        return None
+
+    if _shards is not None and _shards.folder == folder:
+        _shards.refresh()
+        return _shards
+
+    from Modules.SkillShards import ShardedSkills
+
+    _shards = ShardedSkills(folder)
+    return _shards
+
+
+def getBackend(exact: bool = False) -> Union["SkillStore", "ShardedSkills", SkillPack, SkillIndex]:
+    '''Return whatever can search all of the skills:
+    the database if there is one, then the folder of packs if there is one,
+    otherwise the SkillIndex of skills.json
+
+    exact: (optional) only exact lookups and aliases are needed, so the pack can stand in for skills.json.
+    It never stands in for the database or the folder, which hold different skills. Defaults to False'''
+
+    store = getStore()
+    if store is not None:
+        return store
+
+    shards = getShards()
+    if shards is not None:
+        return shards
 
-        except decoder.JSONDecodeError:
-            error = Popup(title = "Skills Error", text = "Skills file is in the wrong format")
-            error._dieButton.config( command = lambda: exit(0))
-            error._window.mainloop()
+    if exact:
+        pack = getPack()
+        if pack is not None:
+            return pack
 
+    return getIndex()
 
-def searchKey(target: str, json: Dict[Tuple[str,], str]) -> str:
-    '''Return a search's result from the JSON
+
+def searchKey(target: str, json: Union[SkillIndex, SkillPack, "SkillStore", "ShardedSkills", Dict[Tuple[str,], str]]) -> str:
+    '''Return a search's result from the JSON.
+    Pass in a SkillIndex, SkillPack, SkillStore or ShardedSkills when searching more than once so it is only built once
     
     RAISES
     ValueError: key not in JSON'''
 
-    for key, value in json.items():
-        if target in key:
-            return value
+    #getJson can give a LazySkills, which is a Mapping but not a dict
+    if isinstance(json, Mapping):
+        json = SkillIndex(json)
+
+    return json.get(target)
+
+
+commands = FuzzyMatcher(("help", "edit", "search"))
+
+def allAliases(client: Optional["LookupClient"] = None) -> List[str]:
+    '''Return every alias and built in command, such as for tab completion.
+    They come from the daemon if client is connected to one, so nothing is loaded here.
+    Otherwise they come from getBackend(exact = True), so a pack saves parsing skills.json
+
+    client: (optional) connection to the daemon. Defaults to None'''
+
+    if client is not None:
+        try:
+            aliases = client.aliases()
+            if aliases is not None:
+                return aliases
+
+        except OSError:
+            pass  #the daemon stopped, so load them here
+
+    return getBackend(exact = True).aliases() + ["help", "edit", "search "]
+
+
+def closestCommand(search: str, index: Union[SkillIndex, "SkillStore", "ShardedSkills"]) -> Optional[str]:
+    '''Return the built in command or alias closest to a misspelt search,
+    or None if nothing is close enough. Never returns search itself'''
+
+    words = search.split()
+    if not words:
+        return None
+
+    options = [found for found in (commands.best(words[0]), index.suggest(search))
+        if found is not None and found[0] != search.strip()]
+    if not options:
+        return None
+
+    return min(options, key = lambda found: found[1])[0]
+
+
+def answerQuery(query: str, lookup: Union[SkillIndex, SkillPack, "SkillStore", "ShardedSkills"],
+        suggest: bool = False) -> Dict[str, Any]:
+    '''Answer one query as a dict that can be written as a JSON line.
+    Exact lookups come from lookup. "search <words>" queries and suggestions come from lookup if it can search,
+    otherwise from getBackend
+
+    suggest: (optional) for queries that aren't found, add "partials", the aliases the query is the start of,
+    and if there are none "suggestion", the closest command or alias. Defaults to False'''
+
+    try:
+        key = lookup.keyOf(query)
+
+    except ValueError:
+        searching = query.startswith("search ")
+        if not searching and not suggest:
+            return {"query" : query, "found" : False}  #a plain miss doesn't need the backend loaded
+
+        index = lookup if hasattr(lookup, "search") else getBackend()
+
+        if searching:
+            results = [{"key" : list(key), "info" : index.info(key), "score" : score}
+                for key, score in index.search(query[len("search "):])]
+
+            return {"query" : query, "found" : bool(results), "results" : results}
+
+        answer = {"query" : query, "found" : False}
+        answer["partials"] = index.startsWith(query) if query else []
+        answer["suggestion"] = closestCommand(query, index) if not answer["partials"] else None
+
+        return answer
+
+    return {"query" : query, "found" : True, "key" : list(key), "info" : lookup.get(query)}
+
+
+def formatAnswer(answer: Dict[str, Any]) -> str:
+    '''Turn an answer from answerQuery into the text the interactive mode would print'''
+
+    if "results" in answer:
+        if not answer["results"]:
+            return f"{answer['query']}:\nNo skills found.\n\n"
+
+        return "".join(f"{', '.join(result['key'])}:\n{result['info']}\n\n" for result in answer["results"])
+
+    if answer["found"]:
+        return f"{answer['query']}:\n{answer['info']}\n\n"
 
-    raise ValueError("Target not found")
+    return f"{answer['query']}:\nInvalid command.\n\n"
+
+
+def runBatch(queries: Iterable[str], out: TextIO, jsonl: bool = False,
+        lookup: Union[SkillIndex, SkillPack, "SkillStore", "ShardedSkills"] = None) -> int:
+    '''Answer one query per line of queries and write the answers to out.
+    Returns how many queries were answered.
+
+    queries: iterable of lines, such as a file or stdin. Blank lines are skipped.
+    out: where to write the answers. They are written BATCH_CHUNK at a time.
+    jsonl: (optional) write one JSON object per answer instead of text. Defaults to False
+    lookup: (optional) what to answer from. Defaults to getBackend(exact = True)'''
+
+    if lookup is None:
+        lookup = getBackend(exact = True)
+
+    chunk = []
+    count = 0
+
+    for line in queries:
+        query = line.rstrip("\r\n")
+        if not query:
+            continue
+
+        answer = answerQuery(query, lookup)
+        chunk.append(dumps(answer, ensure_ascii = False) + "\n" if jsonl else formatAnswer(answer))
+        count += 1
+
+        if len(chunk) >= BATCH_CHUNK:
+            out.write("".join(chunk))
+            chunk = []
+
+    out.write("".join(chunk))
+    out.flush()
+    return count
 
 
 # show help
 help = '''Commands:
 help: display this.
 edit: displays how to edit the question info/add info.
+search <words>: find the skills whose info mentions the words.
+Tab: complete a command or alias, where supported.
 
 GET QUESTION INFORMATION COMMANDS
 "u" or "understanding"
 "a" or "analysis"
-"e" or "evalutation"
+"e" or "evaluation"
 
 '''
 
@@ -56,27 +375,112 @@ Then run "dumpToSkills.py" from CMD by copying its file path,
 and add "dumpToSkills.py" to the end.
 E.G: C:/desktop/RUAE/dumpToSkills.py
 This will ensure that the format is correct.
+Add " --pack" after it to also make "skills.pack", which loads faster.
 
 '''
 
 if __name__ == "__main__":
+    #--batch [file] answers every line of file, or stdin, instead of asking for commands.
+    #--jsonl writes the answers as JSON lines
+    if "--batch" in argv:
+        position = argv.index("--batch") + 1
+        path = argv[position] if position < len(argv) and not argv[position].startswith("--") else "-"
+
+        if path == "-":
+            runBatch(stdin, stdout, "--jsonl" in argv)
+
+        else:
+            with open(path, encoding = "utf-8") as f:
+                runBatch(f, stdout, "--jsonl" in argv)
+
+        exit(0)
+
+    #--daemon keeps the skills loaded and answers other runs of this script over a Unix socket
+    if "--daemon" in argv:
+        from Modules.LookupServer import runDaemon
+        print(f"Answering lookups on {DAEMON_SOCKET}. Press Ctrl+C to stop.")
+
+        #getBackend only rereads skills.json when it changes
+        runDaemon(lambda query: answerQuery(query, getBackend(), suggest = True), DAEMON_SOCKET, allAliases)
+        exit(0)
+
+    #--serve [port] serves the skills over HTTP for a class to read. See Modules/SkillServer.py
+    if "--serve" in argv:
+        from Modules.SkillServer import runServer
+        position = argv.index("--serve") + 1
+        port = int(argv[position]) if position < len(argv) and argv[position].isdigit() else 8000
+        print(f"Serving the skills on port {port}. Press Ctrl+C to stop.")
+
+        #only rereads skills.json when it changes. Errors are sent to the browser instead of shown in a popup
+        runServer(lambda: indexOf(skillsCache.get()), port = port)
+        exit(0)
+
     print(help)
 
-    json = getJson()
+    #a running daemon (--daemon) already has the skills loaded, so ask it instead of loading them here.
+    #The socket module is only imported if there might be one
+    client = None
+    if exists(DAEMON_SOCKET):
+        from Modules.LookupServer import connect
+        client = connect(DAEMON_SOCKET)
+
+    json = None
+
+    #Tab completes aliases and commands where readline is available
+    from Modules.Completion import enableCompletion
+    enableCompletion(lambda: allAliases(client))
 
     #get search
     while True:
-        search = input("Input command.\n")
-
         try:
-            print(searchKey(search, json))
+            search = input("Input command.\n")
+
+        except EOFError:  #Ctrl+D or the end of piped input
+            break
+
+        answer = None
+        if client is not None:
+            try:
+                answer = client.ask(search)
+
+            except OSError:
+                client = None  #the daemon stopped. Answer here from now on
+
+        if answer is None:
+            #exact lookups can come from the pack in place of skills.json,
+            #so it is only parsed for searches and suggestions
+            if json is None:
+                json = getBackend(exact = True)
+
+            answer = answerQuery(search, json, suggest = True)
+
+        if answer["found"] and "results" not in answer:
+            print(answer["info"])
+
+        #"search" on its own, or with nothing to search for
+        elif search.strip() == "search":
+            print("Usage: search <words>\nFinds the skills whose info mentions the words.\n")
+
+        elif "results" in answer:
+            if not answer["results"]:
+                print("No skills found.\n")
+
+            for result in answer["results"]:
+                print(f"{', '.join(result['key'])}:\n{result['info']}\n")
+
+        elif "help" in search:
+            print(help)
+
+        elif "edit" in search:
+            print(edit)
 
-        except ValueError:
-            if "help" in search:
-                print(help)
+        #offer the aliases that the search could be the start of
+        elif answer.get("partials"):
+            print(f"Invalid command. Did you mean: {', '.join(answer['partials'])}?\n")
 
-            elif "edit" in search:
-                print(edit)
+        #otherwise offer the closest spelling
+        elif answer.get("suggestion") is not None:
+            print(f"Invalid command. Did you mean \"{answer['suggestion']}\"?\n")
 
-            else:
-                print("Invalid command.\n")
+        else:
+            print("Invalid command.\n")
@@ -0,0 +1,67 @@
+'''Tab completion for the command line prompt.
+Uses readline when it is available. Without it, such as on Windows, the prompt works as before without completion'''
+
+from bisect import bisect_left
+from typing import Callable, Iterable, List, Optional
+
+class Completer:
+    '''Completes the whole line from a sorted list of words,
+    so that each Tab is two binary searches however many aliases there are.
+
+    ATTRIBUTES
+    getWords: function that returns every word that can be completed.
+    words: sorted list of the words. Made on the first Tab so startup doesn't pay for it.
+    _matches: list of the words that complete the text of the current Tab.
+    '''
+
+    def __init__(self, getWords: Callable[[], Iterable[str]]):
+        '''getWords: function that returns every alias and command that can be completed'''
+
+        self.getWords = getWords
+        self.words = None
+        self._matches = []
+
+
+    def matches(self, text: str) -> List[str]:
+        '''Return every word starting with text in alphabetical order'''
+
+        if self.words is None:
+            self.words = sorted(set(self.getWords()))
+
+        start = bisect_left(self.words, text)
+        end = bisect_left(self.words, text + "\U0010ffff", start)  #the highest code point sorts after any continuation
+        return self.words[start:end]
+
+
+    def complete(self, text: str, state: int) -> Optional[str]:
+        '''readline's completer. Called with state 0, 1, 2... until it returns None'''
+
+        if state == 0:
+            self._matches = self.matches(text)
+
+        return self._matches[state] if state < len(self._matches) else None
+
+
+def enableCompletion(getWords: Callable[[], Iterable[str]]) -> bool:
+    '''Complete the words from getWords when Tab is pressed at input().
+    Returns False if readline isn't available, in which case nothing changes'''
+
+    try:
+        import readline
+
+    except ImportError:
+        return False
+
+    readline.set_completer(Completer(getWords).complete)
+
+    #aliases can have spaces in them, so the whole line is completed
+    readline.set_completer_delims("")
+
+    #macOS ships libedit in place of GNU readline, which takes different bindings
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+
+    else:
+        readline.parse_and_bind("tab: complete")
+
+    return True
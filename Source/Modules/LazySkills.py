@@ -0,0 +1,128 @@
+'''Lazy loader for very large skills files.
+The file is scanned once to find where each value is,
+and values are only decoded the first time they are used'''
+
+from collections.abc import Mapping
+from json import loads, decoder
+from mmap import mmap, ACCESS_READ
+from typing import Tuple, Union, Iterator
+import re
+
+#a JSON string, written so that long strings don't backtrack.
+#Only the escapes and characters that json.loads accepts are matched,
+#so a value that is scanned can always be decoded when it is used
+_STRING = rb'"[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"'
+
+#one "key" : "value" pair and whatever comes after it
+_pair = re.compile(rb'(' + _STRING + rb')[ \t\n\r]*:[ \t\n\r]*(' + _STRING + rb')[ \t\n\r]*([,}]?)[ \t\n\r]*', re.S)
+_space = re.compile(rb'[ \t\n\r]*')
+
+
+class LazySkills(Mapping):
+    '''Read only dict of (alias, alias) : info, like getJson returns,
+    where each info is decoded on first access.
+
+    ATTRIBUTES
+    _data: the bytes or memory mapped file being read.
+    _spans: dict of key : (start, end) byte offsets of its undecoded value.
+    _values: dict of key : info for values that have been decoded.
+    '''
+
+    def __init__(self, source: Union[str, bytes]):
+        '''source: either the bytes of a skills file, or the string file path of one.
+        Paths are memory mapped so the file is never read into memory all at once
+
+        RAISES
+        OSError: the file can't be opened
+        json.decoder.JSONDecodeError: the file is in the wrong format'''
+
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                try:
+                    source = mmap(f.fileno(), 0, access = ACCESS_READ)
+
+                except ValueError:
+                    source = b""  #empty files can't be mapped
+
+        self._data = source
+        self._spans = {}
+        self._values = {}
+
+        self._scan()
+
+
+    def _fail(self, message: str, position: int):
+        #only the text before the error is decoded, to work out the line and column
+        before = bytes(self._data[:position]).decode("utf-8", "replace")
+        raise decoder.JSONDecodeError(message, before, len(before))
+
+
+    def _skip(self, position: int) -> int:
+        return _space.match(self._data, position).end()
+
+
+    def _expect(self, char: bytes, position: int) -> int:
+        '''Check that char is at position and return the position after it'''
+
+        if self._data[position:position + 1] != char:
+            self._fail(f"Expecting {char.decode()}", position)
+
+        return position + 1
+
+
+    def _scan(self):
+        '''Record the key and value offsets of the top level object.
+        Only keys are decoded'''
+
+        data = self._data
+        position = self._expect(b"{", self._skip(0))
+        position = self._skip(position)
+
+        if data[position:position + 1] == b"}":
+            position += 1
+
+        else:
+            while True:
+                pair = _pair.match(data, position)
+                if pair is None:
+                    self._fail("Expecting a string key and string value, with no invalid \\escapes or control characters", position)
+
+                #most keys have no escapes so can skip the JSON decoder
+                key = pair.group(1).decode("utf-8", "replace")
+                key = key[1:-1] if "\\" not in key else loads(key)
+
+                #convert keys back to list
+                self._spans[tuple(key.split(", "))] = pair.span(2)
+
+                position = pair.end()
+                if pair.group(3) == b"}":
+                    break
+
+                if pair.group(3) != b",":
+                    self._fail("Expecting , or }", position)
+
+        if self._skip(position) != len(data):
+            self._fail("Extra data", position)
+
+
+    def __getitem__(self, key: Tuple[str,]) -> str:
+        try:
+            return self._values[key]
+
+        except KeyError:
+            start, end = self._spans[key]
+            #_scan has checked the escapes, and bad UTF-8 becomes U+FFFD, so this can't fail after loading
+            value = self._values[key] = loads(bytes(self._data[start:end]).decode("utf-8", "replace"))
+            return value
+
+
+    def __iter__(self) -> Iterator[Tuple[str,]]:
+        return iter(self._spans)
+
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+
+    def __contains__(self, key) -> bool:
+        return key in self._spans
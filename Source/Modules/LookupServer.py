@@ -0,0 +1,173 @@
+'''A resident lookup daemon on a Unix domain socket and the client the command line uses to talk to it.
+The daemon keeps the skills loaded, so each question only costs a round trip
+instead of starting Python and parsing the skills file.
+
+The protocol is JSON lines: the client sends a query followed by a newline,
+and the daemon replies with one line of JSON, the answer from RUAE_Revision.answerQuery.
+The query ALIASES_QUERY instead gets {"aliases" : [alias]}, for tab completion'''
+
+from json import dumps, loads
+from os import unlink, path as osPath
+from typing import Callable, Dict, List, Any, Optional
+import signal
+import socket
+
+SOCKET_PATH = "ruae.sock"
+
+#a tab can't be typed at a prompt with completion, so it can't clash with a real query
+ALIASES_QUERY = "\t"
+
+class LookupClient:
+    '''A connection to a running daemon.
+
+    ATTRIBUTES
+    path: string path of the daemon's socket.
+    _socket: the connected socket.
+    _file: binary file over the socket for reading and writing lines.
+    '''
+
+    #seconds to wait for the daemon before giving up on it
+    TIMEOUT = 5
+
+    def __init__(self, path: str = SOCKET_PATH):
+        '''path: (optional) the daemon's socket. Defaults to SOCKET_PATH
+
+        RAISES
+        OSError: the daemon isn't running or Unix sockets aren't supported'''
+
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported here")
+
+        self.path = path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(self.TIMEOUT)
+
+        try:
+            self._socket.connect(path)
+
+        except OSError:
+            self._socket.close()
+            raise
+
+        self._file = self._socket.makefile("rwb")
+
+
+    def ask(self, query: str) -> Dict[str, Any]:
+        '''Return the daemon's answer to query
+
+        RAISES
+        OSError: the daemon stopped or took too long to answer'''
+
+        self._file.write(query.encode("utf-8") + b"\n")
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("The daemon closed the connection")
+
+        return loads(line)
+
+
+    def aliases(self) -> Optional[List[str]]:
+        '''Return every alias and command the daemon can complete,
+        or None if it was started without a way to list them
+
+        RAISES
+        OSError: the daemon stopped or took too long to answer'''
+
+        return self.ask(ALIASES_QUERY).get("aliases")
+
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+
+def connect(path: str = SOCKET_PATH) -> Optional[LookupClient]:
+    '''Return a client for the daemon at path, or None if it isn't running'''
+
+    if not osPath.exists(path):
+        return None
+
+    try:
+        return LookupClient(path)
+
+    except OSError:
+        return None
+
+
+async def serve(answer: Callable[[str], Dict[str, Any]], path: str = SOCKET_PATH,
+        aliases: Callable[[], List[str]] = None):
+    '''Answer queries from any number of clients until cancelled.
+
+    answer: function that turns a query into a dict that can be sent as JSON
+    path: (optional) where to put the socket. Defaults to SOCKET_PATH
+    aliases: (optional) function that returns every alias, sent for ALIASES_QUERY. Defaults to None'''
+
+    #only the daemon needs asyncio, so the client doesn't import it
+    import asyncio
+
+    async def client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                query = line.decode("utf-8").rstrip("\r\n")
+
+                try:
+                    if query == ALIASES_QUERY and aliases is not None:
+                        reply = {"aliases" : aliases()}
+
+                    else:
+                        reply = answer(query)
+
+                except Exception as error:
+                    #a bad query mustn't take the daemon down
+                    reply = {"query" : query, "found" : False, "error" : str(error)}
+
+                writer.write(dumps(reply, ensure_ascii = False).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        except (ConnectionError, UnicodeDecodeError):
+            pass  #the client went away or sent garbage
+
+        except asyncio.CancelledError:
+            pass  #the daemon is stopping
+
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(client, path)
+    async with server:
+        await server.serve_forever()
+
+
+def runDaemon(answer: Callable[[str], Dict[str, Any]], path: str = SOCKET_PATH,
+        aliases: Callable[[], List[str]] = None):
+    '''Run the daemon in the foreground until it is interrupted or terminated.
+    A socket left behind by a daemon that crashed is replaced.
+    Takes the same arguments as serve
+
+    RAISES
+    OSError: another daemon is already using path'''
+
+    import asyncio
+
+    client = connect(path)
+    if client is not None:
+        client.close()
+        raise OSError(f"A daemon is already running on {path}")
+
+    if osPath.exists(path):
+        unlink(path)
+
+    #stop the same way as Ctrl+C so the socket is cleaned up
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        asyncio.run(serve(answer, path, aliases))
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        if osPath.exists(path):
+            unlink(path)
@@ -0,0 +1,414 @@
+'''Lookup structures for the skills data.
+These are built once when the skills are loaded so that searches
+don't have to scan every entry'''
+
+from typing import Dict, Tuple, List, Iterator, Iterable, Optional
+from math import log
+from heapq import nlargest
+from time import perf_counter
+import re
+
+_WORD = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    '''Split text into case-folded words, ignoring punctuation'''
+    return _WORD.findall(text.casefold())
+
+
+class _TrieNode:
+    '''A single character of the alias trie
+
+    ATTRIBUTES
+    children: dict of character : _TrieNode.
+    alias: the full alias if an alias ends at this node, otherwise None.
+    '''
+
+    __slots__ = ("children", "alias")
+
+    def __init__(self):
+        self.children = {}
+        self.alias = None
+
+
+class AliasTrie:
+    '''Prefix tree of aliases used for partial matches
+
+    ATTRIBUTES
+    _root: the empty-prefix node that every alias hangs off.
+    '''
+
+    def __init__(self, aliases: List[str] = ()):
+        '''aliases: (optional) the aliases to insert'''
+
+        self._root = _TrieNode()
+
+        for alias in aliases:
+            self.insert(alias)
+
+
+    def insert(self, alias: str):
+        '''Add alias to the trie'''
+
+        node = self._root
+        for char in alias:
+            try:
+                node = node.children[char]
+
+            except KeyError:
+                node.children[char] = node = _TrieNode()
+
+        node.alias = alias
+
+
+    def startsWith(self, prefix: str) -> List[str]:
+        '''Return every alias beginning with prefix in alphabetical order.
+        Costs the length of the prefix plus the number of matches,
+        not the number of aliases'''
+
+        #walk down to the node for the prefix
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        #collect everything below it
+        found = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.alias is not None:
+                found.append(node.alias)
+
+            stack.extend(node.children.values())
+
+        found.sort()
+        return found
+
+
+class TextIndex:
+    '''Inverted index over the aliases and info of each skill, ranked with BM25.
+    Word positions are kept so that phrases score higher than scattered words.
+
+    ATTRIBUTES
+    keys: list of the skill keys. A document's id is its position in this list.
+    _postings: dict of word : {document id : [positions]}.
+    _lengths: list of the number of words in each document.
+    _averageLength: float mean of _lengths, or 1 if they are all 0.
+    _norms: list of the BM25 length normalisation of each document.
+    '''
+
+    #BM25 tuning. k1 limits how much repeats of a word count, b is how much long documents are penalised
+    K1 = 1.2
+    B = 0.75
+
+    #fraction of documents a word must be in to only score documents that rarer words found
+    COMMON = 0.25
+
+    #score multiplier for documents containing the query words next to each other in order
+    PHRASE_BOOST = 2.0
+
+    def __init__(self, skills: Dict[Tuple[str,], str]):
+        '''skills: dict of (alias, alias) : info'''
+
+        self.keys = []
+        self._postings = {}
+        self._lengths = []
+
+        for key, info in skills.items():
+            document = len(self.keys)
+            self.keys.append(key)
+
+            words = tokenize(" ".join(key) + " " + info)
+            self._lengths.append(len(words))
+
+            for position, word in enumerate(words):
+                self._postings.setdefault(word, {}).setdefault(document, []).append(position)
+
+        #1 when no skill has any words, so the norms below don't divide by 0
+        self._averageLength = (sum(self._lengths) / len(self._lengths)) if any(self._lengths) else 1.0
+
+        #the length part of BM25 only depends on the document, so work it out once
+        self._norms = [self.K1 * (1 - self.B + self.B * length / self._averageLength) for length in self._lengths]
+
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Tuple[str,], float]]:
+        '''Return up to limit (key, score) pairs that best match query, best first.
+        Only documents containing at least one query word are scored'''
+
+        words = tokenize(query)
+        total = len(self.keys)
+        scores = {}
+
+        #rarest words first. Words in most documents barely change the ranking,
+        #so they only add to documents that a rarer word already found
+        found = sorted((self._postings[word] for word in set(words) if word in self._postings), key = len)
+        for postings in found:
+            #rarer words are worth more
+            idf = log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+
+            if scores and len(postings) > total * self.COMMON:
+                documents = [(document, postings[document]) for document in scores if document in postings]
+
+            else:
+                documents = postings.items()
+
+            for document, positions in documents:
+                frequency = len(positions)
+                scores[document] = scores.get(document, 0.0) + idf * frequency * (self.K1 + 1) / (frequency + self._norms[document])
+
+        if len(words) > 1:
+            for document in scores:
+                if self._hasPhrase(words, document):
+                    scores[document] *= self.PHRASE_BOOST
+
+        best = nlargest(limit, scores.items(), key = lambda item: item[1])
+        return [(self.keys[document], score) for document, score in best]
+
+
+    def _hasPhrase(self, words: List[str], document: int) -> bool:
+        '''Check if words appear in document consecutively and in order'''
+
+        try:
+            starts = set(self._postings[words[0]][document])
+            for offset, word in enumerate(words[1:], 1):
+                positions = self._postings[word][document]
+                starts.intersection_update(position - offset for position in positions)
+
+        except KeyError:
+            return False
+
+        return bool(starts)
+
+
+def editDistance(first: str, second: str, limit: int) -> int:
+    '''Return the Levenshtein distance between first and second,
+    counting swapped neighbours as one edit.
+    Gives up and returns limit + 1 as soon as the distance must be over limit'''
+
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+
+    previous = None
+    row = list(range(len(second) + 1))
+    for i, char in enumerate(first, 1):
+        before, previous, row = previous, row, [i] + [0] * len(second)
+
+        for j, other in enumerate(second, 1):
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (char != other))
+
+            #transposition
+            if i > 1 and j > 1 and char == second[j - 2] and first[i - 2] == other:
+                row[j] = min(row[j], before[j - 2] + 1)
+
+        if min(row) > limit:
+            return limit + 1
+
+    return row[-1]
+
+
+class FuzzyMatcher:
+    '''Finds the closest word to a misspelling using a trigram index.
+    Candidates sharing the most trigrams are checked with editDistance.
+    The work done per lookup is capped, so it takes about the same time
+    for ten words or ten thousand.
+
+    ATTRIBUTES
+    words: list of the words that can be suggested.
+    _trigrams: dict of trigram : list of indexes into words.
+    '''
+
+    #most trigram postings read per lookup. The rarest trigrams are read first
+    SCAN_LIMIT = 5000
+
+    #most candidates checked with editDistance per lookup
+    MAX_CANDIDATES = 50
+
+    #seconds to spend checking candidates before returning the best so far
+    BUDGET = 0.002
+
+    def __init__(self, words: Iterable[str]):
+        '''words: the words that can be suggested'''
+
+        self.words = list(dict.fromkeys(words))
+        self._trigrams = {}
+
+        for index, word in enumerate(self.words):
+            for trigram in set(self.trigrams(word)):
+                self._trigrams.setdefault(trigram, []).append(index)
+
+
+    @staticmethod
+    def trigrams(word: str) -> List[str]:
+        '''Split word into overlapping groups of three characters.
+        It is padded so the start of the word counts for more than the middle'''
+
+        padded = f"  {word.casefold()} "
+        return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+    @staticmethod
+    def maxDistance(word: str) -> int:
+        '''The most edits allowed for a suggestion for word. Short words get fewer'''
+        return min(1 + len(word) // 5, 3)
+
+
+    def best(self, word: str) -> Optional[Tuple[str, int]]:
+        '''Return (suggestion, edit distance) for the closest word,
+        or None if nothing is close enough'''
+
+        word = word.casefold()
+        limit = self.maxDistance(word)
+
+        #count shared trigrams, reading the rarest (most telling) trigrams first
+        postings = sorted((self._trigrams[trigram] for trigram in set(self.trigrams(word))
+            if trigram in self._trigrams), key = len)
+
+        counts = {}
+        scanned = 0
+        for posting in postings:
+            scanned += len(posting)
+            if scanned > self.SCAN_LIMIT and counts:
+                break
+
+            for index in posting:
+                counts[index] = counts.get(index, 0) + 1
+
+        #check the candidates with the most shared trigrams until time runs out
+        deadline = perf_counter() + self.BUDGET
+        found = None
+        for index in nlargest(self.MAX_CANDIDATES, counts, key = counts.get):
+            candidate = self.words[index]
+            distance = editDistance(word, candidate.casefold(), limit)
+
+            if distance <= limit:
+                found = (candidate, distance)
+                if distance <= 1:
+                    break
+
+                limit = distance - 1
+
+            if perf_counter() > deadline:
+                break
+
+        return found
+
+
+class SkillIndex:
+    '''Alias lookup for the skills returned by RUAE_Revision.getJson.
+    Shared by the command line and the GUI.
+
+    ATTRIBUTES
+    skills: the dict of (alias, alias) : info that the index was built from.
+    _aliases: dict of alias : key in skills. Used for exact lookups.
+    _trie: AliasTrie of every alias. Used for partial lookups.
+    _text: TextIndex of every skill. Built on the first search.
+    _fuzzy: FuzzyMatcher of every alias. Built on the first suggestion.
+    '''
+
+    def __init__(self, skills: Dict[Tuple[str,], str]):
+        '''skills: dict of (alias, alias) : info. Usually from getJson'''
+
+        self.skills = skills
+        self._aliases = {}
+
+        for key in skills:
+            for alias in key:
+                #the first entry to claim an alias wins, like the old linear scan
+                self._aliases.setdefault(alias, key)
+
+        self._trie = AliasTrie(self._aliases)
+        self._text = None
+        self._fuzzy = None
+
+
+    def get(self, alias: str) -> str:
+        '''Return the info for alias
+
+        RAISES
+        ValueError: alias is not in the index'''
+
+        try:
+            return self.skills[self._aliases[alias]]
+
+        except KeyError:
+            raise ValueError("Target not found") from None
+
+
+    def keyOf(self, alias: str) -> Tuple[str,]:
+        '''Return the key of the entry that alias belongs to
+
+        RAISES
+        ValueError: alias is not in the index'''
+
+        try:
+            return self._aliases[alias]
+
+        except KeyError:
+            raise ValueError("Target not found") from None
+
+
+    def info(self, key: Tuple[str,]) -> str:
+        '''Return the info of the entry with key, such as one from search
+
+        RAISES
+        KeyError: no entry has that key'''
+
+        return self.skills[key]
+
+
+    def startsWith(self, prefix: str) -> List[str]:
+        '''Return every alias beginning with prefix in alphabetical order'''
+
+        return self._trie.startsWith(prefix)
+
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Tuple[str,], float]]:
+        '''Full text search of the skills. Returns up to limit (key, score) pairs, best first'''
+
+        if self._text is None:
+            self._text = TextIndex(self.skills)
+
+        return self._text.search(query, limit)
+
+
+    def suggest(self, alias: str) -> Optional[Tuple[str, int]]:
+        '''Return (alias, edit distance) for the alias closest to a misspelt one,
+        or None if nothing is close enough'''
+
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyMatcher(self._aliases)
+
+        return self._fuzzy.best(alias)
+
+
+    def warm(self):
+        '''Build the search and suggestion indexes now instead of on first use,
+        such as from a background thread at startup.
+        Reading every skill's info for the search index also finds any that fail to decode'''
+
+        if self._text is None:
+            self._text = TextIndex(self.skills)
+
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyMatcher(self._aliases)
+
+
+    def aliases(self) -> List[str]:
+        '''Return every alias in the index'''
+
+        return list(self._aliases)
+
+
+    def items(self) -> Iterator[Tuple[Tuple[str,], str]]:
+        '''Iterate over (key, info) pairs in file order'''
+
+        return iter(self.skills.items())
+
+
+    def __contains__(self, alias: str) -> bool:
+        return alias in self._aliases
+
+
+    def __len__(self) -> int:
+        return len(self.skills)
@@ -0,0 +1,209 @@
+'''Serves the skills over HTTP so a class can read one teacher's skill bank from their browsers.
+
+GET /skills              the whole bank, in the same format as skills.json
+GET /skills/<alias>      {"key" : [alias, alias], "info" : info}
+GET /search?q=<words>    {"results" : [{"key", "info", "score"}]}
+
+Every response has an ETag, so clients that send If-None-Match get an empty 304 when nothing changed,
+and bodies are gzipped for clients that accept it.
+Requests are handled by a fixed pool of threads'''
+
+from concurrent.futures import ThreadPoolExecutor
+from gzip import compress
+from hashlib import blake2b
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from json import dumps
+from threading import Lock
+from typing import Callable, Tuple, Any
+from urllib.parse import urlsplit, parse_qs, unquote
+from Modules.SkillIndex import SkillIndex
+
+#bodies smaller than this aren't worth gzipping
+GZIP_MIN = 1024
+
+class Representation:
+    '''One response body with everything needed to send it: its ETag and its gzipped form.
+
+    ATTRIBUTES
+    body: bytes of the JSON.
+    etag: string quoted ETag made from a hash of body.
+    gzipped: bytes of body gzipped, or None if it is too small to bother.
+    gzipEtag: string ETag of gzipped. Each encoding needs its own.
+    '''
+
+    def __init__(self, data: Any):
+        '''data: anything that can be dumped as JSON'''
+
+        self.body = dumps(data, ensure_ascii = False).encode("utf-8")
+        self.etag = f'"{blake2b(self.body, digest_size = 16).hexdigest()}"'
+        self.gzipped = compress(self.body, 6) if len(self.body) >= GZIP_MIN else None
+        self.gzipEtag = f'{self.etag[:-1]}-gzip"'
+
+
+class SkillServer(HTTPServer):
+    '''HTTP server for one skill bank. Connections are handed to a pool of worker threads.
+
+    ATTRIBUTES
+    getIndex: function that returns the current SkillIndex, such as RUAE_Revision.getIndex.
+    It is called for every request, so it must be cheap when nothing has changed.
+    pool: ThreadPoolExecutor that handles the connections.
+    _index: the SkillIndex the cached representations were made from.
+    _cache: dict of request path : Representation for _index. Searches aren't cached
+    because there is no limit to how many different ones there can be.
+    _cacheLock: guards _index and _cache.
+    '''
+
+    #the bank is read only, so a restart can reuse the port straight away
+    allow_reuse_address = True
+
+    #more than the default so bursts of new connections aren't refused
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], getIndex: Callable[[], SkillIndex], workers: int = 32):
+        '''address: (host, port) to listen on. Port 0 picks a free port
+        getIndex: function that returns the current SkillIndex
+        workers: (optional) number of threads handling connections. Defaults to 32'''
+
+        super().__init__(address, SkillHandler)
+
+        self.getIndex = getIndex
+        self.pool = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "skills http")
+        self._index = None
+        self._cache = {}
+        self._cacheLock = Lock()
+
+
+    def process_request(self, request, clientAddress):
+        self.pool.submit(self._processRequest, request, clientAddress)
+
+
+    def _processRequest(self, request, clientAddress):
+        #the same as socketserver.ThreadingMixIn.process_request_thread
+        try:
+            self.finish_request(request, clientAddress)
+
+        except Exception:
+            self.handle_error(request, clientAddress)
+
+        finally:
+            self.shutdown_request(request)
+
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait = False, cancel_futures = True)
+
+
+    def representation(self, path: str, build: Callable[[SkillIndex], Any]) -> Representation:
+        '''Return the cached representation of path, building it with build(index) if the index has changed'''
+
+        index = self.getIndex()
+
+        with self._cacheLock:
+            if index is not self._index:
+                self._index = index
+                self._cache = {}
+
+            found = self._cache.get(path)
+
+        if found is None:
+            found = Representation(build(index))
+
+            with self._cacheLock:
+                if index is self._index:
+                    self._cache[path] = found
+
+        return found
+
+
+class SkillHandler(BaseHTTPRequestHandler):
+    '''Answers the requests for one connection. Connections are kept alive between requests'''
+
+    protocol_version = "HTTP/1.1"
+
+    #seconds an idle kept alive connection can hold a worker thread for
+    timeout = 5
+
+    #headers and body are separate writes, which Nagle's algorithm would hold back about 40 ms on kept alive connections
+    disable_nagle_algorithm = True
+
+    server: SkillServer
+
+    def do_GET(self):
+        try:
+            self.route(urlsplit(self.path))
+
+        except (OSError, ValueError) as error:  #the skills file can't be read or is in the wrong format
+            self.send(500, Representation({"error" : f"Skills file could not be loaded: {error}"}))
+
+
+    def route(self, url):
+        '''Send the response for the split url'''
+
+        if url.path == "/skills":
+            found = self.server.representation("/skills", lambda index: {", ".join(key) : info for key, info in index.items()})
+            return self.send(200, found)
+
+        if url.path.startswith("/skills/"):
+            alias = unquote(url.path[len("/skills/"):])
+
+            if alias not in self.server.getIndex():
+                return self.send(404, Representation({"error" : "Target not found", "alias" : alias}))
+
+            found = self.server.representation(url.path, lambda index: {"key" : list(index.keyOf(alias)), "info" : index.get(alias)})
+            return self.send(200, found)
+
+        if url.path == "/search":
+            query = parse_qs(url.query).get("q", [""])[0]
+            index = self.server.getIndex()
+            return self.send(200, Representation({"results" : [{"key" : list(key), "info" : index.info(key), "score" : score}
+                for key, score in index.search(query)]}))
+
+        self.send(404, Representation({"error" : "Not found"}))
+
+
+    def send(self, status: int, found: Representation):
+        '''Send found, or a 304 if the client already has it'''
+
+        gzipped = found.gzipped is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        body, etag = (found.gzipped, found.gzipEtag) if gzipped else (found.body, found.etag)
+
+        if status == 200 and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")  #always revalidate, the ETag makes that cheap
+        self.send_header("Vary", "Accept-Encoding")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def log_message(self, format: str, *args):
+        pass  #a line per request would slow the server down more than anything else
+
+
+def runServer(getIndex: Callable[[], SkillIndex], host: str = "", port: int = 8000, workers: int = 32):
+    '''Serve the skills until interrupted.
+
+    getIndex: function that returns the current SkillIndex
+    host: (optional) address to listen on. Defaults to every address, so other computers can connect
+    port: (optional) port to listen on. Defaults to 8000
+    workers: (optional) number of threads handling connections. Defaults to 32'''
+
+    with SkillServer((host, port), getIndex, workers) as server:
+        try:
+            server.serve_forever()
+
+        except KeyboardInterrupt:
+            pass
@@ -1,34 +1,78 @@
 '''The command line app but with a GUI'''
 
-from typing import *
+from typing import Tuple, Dict, Optional, Any
 from Modules.MyUtils import WidgetFactory
-from Modules.Widgets import Popup, ToggleButton, ToolTip, DimensionGetter
-from RUAE_Revision import *
+from Modules.Widgets import Popup, ToggleButton, ToolTip, DimensionGetter, ThemeEngine, VirtualGrid, SelectionGroup
+from Modules.SkillIndex import SkillIndex
+from Modules.Settings import Settings
+from Modules.AsyncBridge import AsyncBridge
+from Modules.Instrumentation import Instrumentation
+from RUAE_Revision import getIndex, indexOf, skillsCache, edit
 from tkinter import Tk, Button, Label, Frame, OptionMenu, BooleanVar, Radiobutton
-from json import dump, load, decoder
-from sys import exit
+from json import decoder
+from sys import exit, argv
+from time import perf_counter
 import asyncio
 
+# startup times are measured from here
+STARTED = perf_counter()
+
 WINDOW = Tk()
 WINDOW.minsize(645, 269)
 
-class InfoButton(ToggleButton):
-    brothers = []
+# disk reads run on the asyncio loop so the window never waits on them
+bridge = AsyncBridge(WINDOW)
+
+
+async def loadIndex() -> SkillIndex:
+    '''getIndex without blocking the Tk thread. Run it with bridge.submit
+
+    RAISES
+    OSError: the skills file can't be read
+    json.decoder.JSONDecodeError: the skills file is in the wrong format'''
+
+    skills = await asyncio.to_thread(skillsCache.get)
+    return await asyncio.to_thread(indexOf, skills)
+
+
+async def loadSettings(path: str = "settings.json") -> Settings:
+    '''Load the settings file without blocking the Tk thread. Run it with bridge.submit
+
+    RAISES
+    OSError: the file can't be read
+    json.decoder.JSONDecodeError: the file is in the wrong format'''
+
+    return await asyncio.to_thread(Settings, path)
+
+
+async def preload() -> SkillIndex:
+    '''Load and check the skills file and build all of its lookup indexes on a worker thread'''
+
+    index = await loadIndex()
+    await asyncio.to_thread(index.warm)
+    return index
+
 
+def showLoadError(error: BaseException):
+    '''Report a file that failed to load in the background. Runs on the Tk thread'''
+
+    if isinstance(error, decoder.JSONDecodeError):
+        Popup(title = "Skills Error", text = "Skills file is in the wrong format", command = lambda: exit(0))
+
+    else:
+        Popup(title = "Skills Error", text = f"Skills file could not be read\n{error}")
+
+
+class InfoButton(ToggleButton):
     def __init__(self, info: str, factory: WidgetFactory, coords: Tuple[float, float], **kwargs):
         self.info = info
+        self.key = None  #the skill the button is showing
         ToggleButton.__init__(self, factory, coords, **kwargs)
         self.commands.append(self.loadInfo)
 
     def loadInfo(self):
         '''Search for the first Label popout and change its text to self.info'''
 
-        for brother in InfoButton.brothers:
-            if brother is self:
-                continue
-
-            brother.button.config(fg = brother.colours[0])
-
         for popout in self.popouts:
             if type(popout[0]) is Label:
                 return popout[0].config(text = self.info)
@@ -41,100 +85,272 @@ class Page:
 
     darkColours = {"bg" : "#000000", "fg" : "#ffffff"}
 
+    # the theme engine also needs the page background and radio button colours
+    lightPalette = dict(lightColours, page = "#d9d9d9", select = "white")
+
+    darkPalette = dict(darkColours, page = "#0d0d0d", select = "black")
+
     dark = None
 
-    infoButtons = []  #must be cleaned up
+    theme = None
 
-    def __init__(self):
-        # get theme
-        if self.dark is None:
-            Page.dark = BooleanVar()
-            with open("settings.json") as f:
-                try:
-                    self.dark.set(load(f)["dark"])
+    settings = None
 
-                except decoder.JSONDecodeError:
-                    error = Popup(title = "Settings Error", text = "Settings file is in the wrong format")
-                    error._dieButton.config( command = lambda: exit(0))
+    infoButtons = []  #must be cleaned up
 
-            self.dark.trace("w", self.changeTheme)
+    def __init__(self):
+        self.setUp()
 
         if self.dark.get():
             self.colours = self.darkColours
-            backgroundColour = "#0d0d0d"
 
         else:
             self.colours = self.lightColours
-            backgroundColour = "#d9d9d9"
 
-        # create factory
-        self.factory = WidgetFactory(master = WINDOW, **self.colours, relative = True, width = 18)
-
-        # create background for clearing the screeen
-        self.background = Frame(WINDOW, bg = backgroundColour)
+        # create background. Everything on the page goes on it so raising it shows the page
+        self.background = self.theme.register(Frame(WINDOW), bg = "page")
         self.background.place(x = 0, y = 0, relwidth = 1, relheight = 1)
 
+        # create factory
+        self.factory = WidgetFactory(master = self.background, **self.colours, relative = True, width = 18)
+
         # draw movement buttons
         # home button
-        self.factory.generalBuilder(Button, (0, 0), relative = True, text ="HOME", command = lambda: self.movePage(InfoPage))
+        self.theme.register(self.factory.generalBuilder(Button, (0, 0), relative = True, text ="HOME",
+            command = lambda: self.movePage(InfoPage)), fg = "fg", bg = "bg")
 
         # tools button
-        self.factory.generalBuilder(Button, (0.25, 0), relative = True, text = "TOOLS", command = lambda: self.movePage(ToolsPage))
+        self.theme.register(self.factory.generalBuilder(Button, (0.25, 0), relative = True, text = "TOOLS",
+            command = lambda: self.movePage(ToolsPage)), fg = "fg", bg = "bg")
+
+
+    @classmethod
+    def setUp(cls):
+        '''Make the theme and start loading the settings. Only happens the first time'''
+
+        if cls.dark is not None:
+            return
+
+        Page.dark = BooleanVar()
+        Page.theme = ThemeEngine(cls.currentPalette())
+        cls.dark.trace("w", cls.changeTheme)
 
+        # the theme is switched when the settings arrive
+        bridge.submit(loadSettings("settings.json"), onResult = cls.useSettings, onError = cls.settingsError)
 
     def movePage(self, target):
         '''Move to target page'''
 
-        InfoButton.brothers = []
+        pages.show(target)
 
-        self.background.destroy()
+    @classmethod
+    def currentPalette(cls) -> dict:
+        '''Return the theme engine palette for the current theme'''
+
+        return cls.darkPalette if cls.dark.get() else cls.lightPalette
 
-        target()
+    @classmethod
+    def useSettings(cls, settings: Settings):
+        '''Apply the settings loaded by loadSettings'''
 
-    def changeTheme(self, *args):  #absorb context
-        Popup(text = "Switch pages to apply the theme", title = "Theme Changed!")
+        cls.settings = settings
+        cls.dark.set(settings.get("dark", False))
 
-        with open("settings.json", "r+") as f:
-            # get current settings and replace only the theme
-            json = dict(load(f))
-            json["dark"] = self.dark.get()
+    @classmethod
+    def settingsError(cls, error: BaseException):
+        '''Report settings that failed to load'''
 
-            # go back to the start and overwrite
-            f.seek(0)
-            dump(json, f)
-            f.truncate()  #prevent error if file is smaller
+        if isinstance(error, decoder.JSONDecodeError):
+            Popup(title = "Settings Error", text = "Settings file is in the wrong format", command = lambda: exit(0))
+
+        else:
+            Popup(title = "Settings Error", text = f"Settings file could not be read\n{error}")
+
+    async def checkStale(self) -> Optional[Dict[str, Any]]:
+        '''Check if the page must be rebuilt. Runs on the asyncio loop so it can read files.
+        Returns None if not, otherwise a dict of the keyword arguments to build the new page with,
+        so anything it loaded isn't loaded again on the Tk thread.
+        Theme changes are applied in place so don't count'''
+
+        return None
+
+    def destroy(self):
+        '''Destroy every widget on the page'''
+
+        self.theme.forget(self.background)
+        self.background.destroy()
+
+    @classmethod
+    def changeTheme(cls, *args):  #absorb context
+        '''Recolour every page in place and save the choice'''
+
+        cls.theme.apply(cls.currentPalette())
+
+        # saved from a background thread so the click doesn't wait on the disk
+        if cls.settings is not None:
+            cls.settings.set("dark", cls.dark.get())
 
 
 class InfoPage(Page):
     '''The page for UAE skills info'''
 
-    def __init__(self):
+    def __init__(self, index: SkillIndex = None):
+        '''index: (optional) the skills to show, such as from preload. Defaults to getIndex()'''
+
         super().__init__()
 
         # info buttons
-        info  = getJson()
+        self.index = index if index is not None else getIndex()
 
         # create containers for buttons and info
-        mainContainer = Frame(self.background, bg = self.colours["bg"])
+        mainContainer = self.theme.register(Frame(self.background), bg = "bg")
         mainContainer.place(relwidth = 0.8, relheight = 0.4, relx = 0.5, rely = 0.35, anchor = "center")
 
-        bottomContainer = Frame(self.background, bg = self.colours["bg"])
+        bottomContainer = self.theme.register(Frame(self.background), bg = "bg")
         bottomContainer.place(relwidth = 0.8, relheight = 0.4, relx = 0.5, rely = 0.8, anchor = "center")
 
         #create info buttons
-        x = 2
-        contents = self.factory.generalBuilder(Label, (0.5, 0.5), master = bottomContainer, anchor = "center", width = 100)  #where the info goes
-        Frame(mainContainer, width = 20, height = 20, bg = self.colours["bg"]).grid(column = 0, row = 0, columnspan = 2)  #push the buttons into the right column
+        self.contents = self.factory.generalBuilder(Label, (0.5, 0.5), master = bottomContainer, anchor = "center", width = 100)  #where the info goes
+        self.theme.register(self.contents, fg = "fg", bg = "bg")
+
+        # only the buttons on screen exist. Scrolling gives them different skills
+        self.selected = None  #key of the skill whose button is on
+        self.positions = None  #dict of key : index in the grid. Made the first time the keyboard is used
+        self.group = SelectionGroup(onChange = self.trackSelection)
+        self.grid = VirtualGrid(mainContainer, list(self.index.skills), self.makeButton, self.showButton, columns = 3, rows = 2)
+        self.theme.register(self.grid, bg = "bg")
+        self.theme.register(self.grid.body, bg = "bg")
+        self.grid.place(relx = 0.5, rely = 0.5, anchor = "center")
+
+        for button in self.grid.cells:
+            self.grid.bindWheel(button.button)
+
+        # arrow keys move between skills
+        WINDOW.bind("<Right>", lambda event: self.moveSelection(1) if pages.current is self else None)
+        WINDOW.bind("<Left>", lambda event: self.moveSelection(-1) if pages.current is self else None)
+
+    def makeButton(self, master: Frame, row: int, column: int) -> InfoButton:
+        '''Create one reusable cell of the grid'''
+
+        # making a button hides its popouts so show the info label again first
+        self.contents.place(relx = 0.5, rely = 0.5, anchor = "center")
+        button = InfoButton("", self.factory, (0, 0), text = "", popouts = (self.contents, ),
+            fgColours = ("red", self.colours["fg"]), master = master)
+        self.group.add(button)
+
+        button.button.place_forget()
+        button.button.grid(column = column, row = row)
 
-        for names, text in info.items():
-            contents.place(relx = 0.5, rely = 0.5, anchor = "center")
-            button = InfoButton(text, self.factory, (x, 0.33), text = f"{names[1].upper()}", popouts = (contents, ),
-                fgColours = ("red", self.colours["fg"]), master = mainContainer)
+        # the "on" colour follows the theme
+        self.theme.register(button.button, bg = "bg")
+        self.theme.registerCallback(button.button, lambda palette: button.setColours(("red", palette["fg"])))
 
-            button.button.place_forget()
-            button.button.grid(column = x, row = 2)
+        return button
 
-            x += 1
+    def showButton(self, button: InfoButton, key: Tuple[str,]):
+        '''Point a cell at the skill with key, or hide it if key is None'''
+
+        # the button no longer shows the selected skill, but the skill stays selected
+        if self.group.active is button and (key is None or key != self.selected):
+            self.group.active = None
+            button.setState(False)
+
+        button.key = key
+        if key is None:
+            button.button.grid_remove()
+            return
+
+        button.info = self.index.info(key)
+        button.button.config(text = f"{key[1].upper()}")
+        button.button.grid()
+
+        if key == self.selected:
+            self.group.setActive(button)
+
+    def trackSelection(self, button: InfoButton):
+        '''Remember which skill is on so that it stays on when its button is reused'''
+
+        self.selected = button.key if button is not None else None
+
+    def moveSelection(self, step: int):
+        '''Select the skill step places after the selected one (before if step is negative),
+        scrolling it into view'''
+
+        keys = self.grid.items
+        if not keys:
+            return
+
+        if self.positions is None:
+            self.positions = {key : index for index, key in enumerate(keys)}
+
+        if self.selected is None:
+            index = 0 if step > 0 else len(keys) - 1
+
+        else:
+            index = (self.positions[self.selected] + step) % len(keys)
+
+        # scroll just far enough for the row to be on screen
+        row = index // self.grid.columns
+        if row < self.grid.firstRow:
+            self.grid.scrollTo(row)
+
+        elif row >= self.grid.firstRow + self.grid.rows:
+            self.grid.scrollTo(row - self.grid.rows + 1)
+
+        self.group.select(self.grid.cells[index - self.grid.firstRow * self.grid.columns])
+
+    async def checkStale(self) -> Optional[Dict[str, Any]]:
+        '''Rebuild with the new index when the skills file has changed'''
+
+        index = await loadIndex()
+        if await super().checkStale() is not None or self.index is not index:
+            return {"index" : index}
+
+        return None
+
+
+class PageManager:
+    '''Builds each page once and switches between them by raising them above the others.
+    Pages are shown straight away, then rebuilt in place with what Page.checkStale returns if it isn't None
+
+    ATTRIBUTES
+    pages: dict of page class : its instance.
+    current: the page being shown.
+    '''
+
+    def __init__(self):
+        self.pages = {}
+        self.current = None
+
+    def show(self, target, **kwargs):
+        '''Show the page of class target, building it if needed.
+        kwargs are passed to target if it is built'''
+
+        page = self.pages.get(target)
+
+        if page is None:
+            page = self.pages[target] = target(**kwargs)
+
+        page.background.tkraise()
+        self.current = page
+
+        bridge.submit(page.checkStale(), onResult = lambda fresh: self.rebuild(page, fresh) if fresh is not None else None,
+            onError = showLoadError)
+
+    def rebuild(self, page: Page, kwargs: Dict[str, Any] = None):
+        '''Replace page with a new one built with kwargs, keeping whichever page is current on top'''
+
+        target = type(page)
+        if self.pages.get(target) is not page:
+            return  #already replaced
+
+        page.destroy()
+        new = self.pages[target] = target(**(kwargs or {}))
+
+        if self.current is page:
+            self.current = new
+
+        self.current.background.tkraise()
 
 
 class ToolsPage(Page):
@@ -144,22 +360,86 @@ class ToolsPage(Page):
         super().__init__()
 
         # change theme choice
-        if self.dark.get():
-            selectcolor = "black"
-
-        else:
-            selectcolor = "white"
+        self.theme.register(self.factory.generalBuilder(Label, (0.0, 0.3), text = "Use Dark Theme?", relative = True),
+            fg = "fg", bg = "bg")
 
-        self.factory.generalBuilder(Label, (0.0, 0.3), text = "Use Dark Theme?", relative = True)
-        darkChoiceYes = Radiobutton(self.background, variable = Page.dark, text = "Yes", value = True, **self.colours,
-            borderwidth =0, selectcolor = selectcolor).place(relx = 0, rely = 0.4)
+        darkChoiceYes = Radiobutton(self.background, variable = Page.dark, text = "Yes", value = True, borderwidth =0)
+        self.theme.register(darkChoiceYes, fg = "fg", bg = "bg", selectcolor = "select").place(relx = 0, rely = 0.4)
 
-        darkChoiceNo = Radiobutton(self.background, variable = Page.dark, text = "No", value = False, **self.colours,
-            borderwidth =0, selectcolor = selectcolor).place(relx = 0, rely = 0.5)
+        darkChoiceNo = Radiobutton(self.background, variable = Page.dark, text = "No", value = False, borderwidth =0)
+        self.theme.register(darkChoiceNo, fg = "fg", bg = "bg", selectcolor = "select").place(relx = 0, rely = 0.5)
 
         # edit info
-        self.factory.generalBuilder(Label, (0.6, 0.3), relative = True, text = f"HOW TO EDIT INFO\n{edit}", width = 65, anchor = "n")
+        self.theme.register(self.factory.generalBuilder(Label, (0.6, 0.3), relative = True, text = f"HOW TO EDIT INFO\n{edit}",
+            width = 65, anchor = "n"), fg = "fg", bg = "bg")
+
+
+class Startup:
+    '''Shows a loading screen on the first frame, loads the files in the background,
+    then swaps in the InfoPage once they are ready.
+
+    ATTRIBUTES
+    times: dict of "firstFrame" and "interactive" : milliseconds since STARTED.
+    report: boolean for whether to print the times once the app is interactive.
+    skeleton: the loading screen, or None once the InfoPage is up.
+    '''
+
+    def __init__(self, report: bool = False):
+        '''report: (optional) print the startup times. Defaults to False'''
+
+        self.times = {}
+        self.report = report
+
+        Page.setUp()
+
+        self.skeleton = Page.theme.register(Frame(WINDOW), bg = "page")
+        self.skeleton.place(x = 0, y = 0, relwidth = 1, relheight = 1)
+        Page.theme.register(Label(self.skeleton, text = "Loading skills..."), fg = "fg", bg = "page").place(
+            relx = 0.5, rely = 0.5, anchor = "center")
+
+        # idle callbacks queued once the window is mapped run after it is drawn
+        self.skeleton.bind("<Map>", self.mapped)
+
+        bridge.submit(preload(), onResult = self.ready, onError = showLoadError)
+
+    def mapped(self, event = None):
+        self.skeleton.unbind("<Map>")
+        WINDOW.after_idle(self.mark, "firstFrame")
+
+    def ready(self, index: SkillIndex):
+        '''Show the InfoPage with the preloaded index'''
+
+        pages.show(InfoPage, index = index)
+
+        Page.theme.forget(self.skeleton)
+        self.skeleton.destroy()
+        self.skeleton = None
+
+        WINDOW.after_idle(self.mark, "interactive")
+
+    def mark(self, name: str):
+        '''Record how long startup took to reach name'''
+
+        self.times[name] = (perf_counter() - STARTED) * 1000
+
+        if name == "interactive" and self.report:
+            print(", ".join(f"{key}: {value:.1f} ms" for key, value in self.times.items()))
+
+
+pages = PageManager()
 
+if __name__ == "__main__":
+    # --profile times the event handlers and writes profile.json on exit, or when F12 is pressed.
+    # Handlers are wrapped before any widgets bind them
+    if "--profile" in argv:
+        profiler = Instrumentation(WINDOW, "profile.json")
+        profiler.wrap(ToggleButton, "callCommands")
+        profiler.wrap(InfoButton, "loadInfo")
+        profiler.wrap(Page, "movePage", "changeTheme")
+        profiler.wrap(PageManager, "show", "rebuild")
+        profiler.wrap(ToolTip, "display", "goToWidget", "die")
+        WINDOW.bind("<F12>", profiler.dump)
 
-InfoPage()
-WINDOW.mainloop()
\ No newline at end of file
+    # --startup-times prints how long the first frame and the InfoPage took
+    startup = Startup(report = "--startup-times" in argv)
+    WINDOW.mainloop()
@@ -0,0 +1,27 @@
+'''Times batch mode answering many queries against one loaded index.
+Run from this folder: python benchmarkBatch.py [number of queries]'''
+
+from io import StringIO
+from sys import argv
+from time import perf_counter
+from benchmarkLookup import makeBank
+from Modules.SkillIndex import SkillIndex
+from RUAE_Revision import runBatch
+
+if __name__ == "__main__":
+    count = int(argv[1]) if len(argv) > 1 else 100000
+    index = SkillIndex(makeBank(10000))
+
+    #mostly hits with some misses, like a class's revision sheet
+    queries = [f"skill{i % 10000}\n" if i % 10 else f"missing{i}\n" for i in range(count)]
+
+    print(f"{count} queries against 10000 skills")
+    print(f"{'format':>6} {'total (ms)':>11} {'queries/s':>10}")
+
+    for jsonl in (False, True):
+        out = StringIO()
+        start = perf_counter()
+        runBatch(queries, out, jsonl, index)
+        taken = perf_counter() - start
+
+        print(f"{'jsonl' if jsonl else 'text':>6} {taken * 1000:>11.1f} {count / taken:>10.0f}")
@@ -0,0 +1,58 @@
+'''Times the per widget overhead of WidgetFactory for a few thousand widgets.
+Resolving the settings is timed without a display.
+Building real widgets is also timed if a display is available.
+Run from this folder: python benchmarkFactory.py [number of widgets]'''
+
+from sys import argv
+from timeit import default_timer
+from tkinter import Tk, Label, TclError
+from Modules.MyUtils import WidgetFactory, removeFromDict
+
+def oldResolve(factory: WidgetFactory, kwargs: dict) -> dict:
+    '''How generalBuilder worked out the settings before templates. Kept as the baseline'''
+    kwargsDict = factory.setToDefaults(kwargs)
+    return removeFromDict(kwargsDict, ["anchor", "sticky", "relative", "labelText"])
+
+
+def perWidget(start: float, count: int) -> float:
+    '''Microseconds per widget since start'''
+    return (default_timer() - start) / count * 1e6
+
+
+if __name__ == "__main__":
+    count = int(argv[1]) if len(argv) > 1 else 3000
+    factory = WidgetFactory(fg = "white", bg = "black", relative = True, width = 18)
+    settings = [{"text" : f"Label {i}", "anchor" : "center", "height" : None} for i in range(count)]
+
+    start = default_timer()
+    for kwargs in settings:
+        oldResolve(factory, kwargs)
+    print(f"resolve settings, old:      {perWidget(start, count):.2f} us per widget")
+
+    start = default_timer()
+    for kwargs in settings:
+        factory.resolve(Label, kwargs)
+    print(f"resolve settings, template: {perWidget(start, count):.2f} us per widget")
+
+    try:
+        window = Tk()
+
+    except TclError:
+        print("No display, so real widgets were not built")
+        raise SystemExit
+
+    factory = WidgetFactory(master = window, fg = "white", bg = "black", relative = True, width = 18)
+    coords = [((i % 50) / 50, (i // 50) / (count / 50)) for i in range(count)]
+
+    start = default_timer()
+    for coord in coords:
+        factory.generalBuilder(Label, coord, text = "x", anchor = "center")
+    window.update()
+    print(f"generalBuilder each:        {perWidget(start, count):.2f} us per widget")
+
+    start = default_timer()
+    factory.batchBuilder(Label, coords, text = "x", anchor = "center")
+    window.update()
+    print(f"batchBuilder:               {perWidget(start, count):.2f} us per widget")
+
+    window.destroy()
@@ -0,0 +1,63 @@
+'''Times alias lookups against skill banks of growing size.
+The linear scan grows with the bank while the index should stay flat.
+Run from this folder: python benchmarkLookup.py'''
+
+from timeit import timeit
+from typing import Dict, Tuple
+from Modules.SkillIndex import SkillIndex
+
+def makeBank(size: int) -> Dict[Tuple[str,], str]:
+    '''Make a fake bank of size entries shaped like getJson's output'''
+    return {(f"s{i}", f"skill{i}") : f"Strategy: number {i}\nKeywords: \"topic{i % 997}\", \"term{i % 89}\"."
+        for i in range(size)}
+
+
+def linearScan(target: str, json: Dict[Tuple[str,], str]) -> str:
+    '''The old searchKey. Kept here as the baseline'''
+    for key, value in json.items():
+        if target in key:
+            return value
+
+    raise ValueError("Target not found")
+
+
+if __name__ == "__main__":
+    runs = 2000
+    print(f"{'entries':>8} {'linear (us)':>12} {'index (us)':>11} {'prefix (us)':>12}")
+
+    for size in (10, 100, 1000, 10000, 100000):
+        bank = makeBank(size)
+        index = SkillIndex(bank)
+
+        #worst case for the scan: the last entry
+        target = f"skill{size - 1}"
+        linear = timeit(lambda: linearScan(target, bank), number = runs) / runs
+        indexed = timeit(lambda: index.get(target), number = runs) / runs
+        prefix = timeit(lambda: index.startsWith(target), number = runs) / runs
+
+        print(f"{size:>8} {linear * 1e6:>12.2f} {indexed * 1e6:>11.3f} {prefix * 1e6:>12.3f}")
+
+    #full text search. topic words are shared by size/997 skills, term words by size/89
+    print(f"\n{'entries':>8} {'build (ms)':>11} {'rare (us)':>10} {'common (us)':>12}")
+
+    for size in (1000, 10000, 50000):
+        bank = makeBank(size)
+        index = SkillIndex(bank)
+        build = timeit(lambda: index.search("warm up"), number = 1)
+
+        rare = timeit(lambda: index.search("topic5 keywords"), number = 200) / 200
+        common = timeit(lambda: index.search("term5"), number = 200) / 200
+
+        print(f"{size:>8} {build * 1e3:>11.1f} {rare * 1e6:>10.1f} {common * 1e6:>12.1f}")
+
+    #typo suggestions. The time per lookup is capped so it should level off
+    print(f"\n{'entries':>8} {'typo (us)':>10} {'no match (us)':>14}")
+
+    for size in (100, 1000, 10000, 100000):
+        index = SkillIndex(makeBank(size))
+        index.suggest("warm up")
+
+        typo = timeit(lambda: index.suggest(f"sklil{size // 2}"), number = 200) / 200
+        miss = timeit(lambda: index.suggest("qqqqqqqq"), number = 200) / 200
+
+        print(f"{size:>8} {typo * 1e6:>10.1f} {miss * 1e6:>14.1f}")
@@ -0,0 +1,84 @@
+'''Compares the peak memory of loading a big skills file eagerly and lazily.
+Each loader runs in its own process so their peaks don't mix.
+Run from this folder: python benchmarkMemory.py [number of skills]'''
+
+from json import dump, load
+from subprocess import run
+from sys import argv, executable
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import tracemalloc
+
+LOADERS = ("eager", "lazy bytes", "lazy mmap")
+
+def peakRss() -> int:
+    '''Return the peak resident memory of this process in KiB, or 0 if it can't be measured'''
+    try:
+        from resource import getrusage, RUSAGE_SELF
+
+    except ImportError:  #Windows
+        return 0
+
+    return getrusage(RUSAGE_SELF).ru_maxrss
+
+
+def child(loader: str, path: str, traced: bool):
+    '''Load path with loader, read one entry, and print the measurements.
+    tracemalloc slows loading down, so it is only turned on when traced is True'''
+
+    from Modules.LazySkills import LazySkills
+
+    before = peakRss()
+    if traced:
+        tracemalloc.start()
+
+    start = perf_counter()
+
+    if loader == "eager":
+        with open(path) as f:
+            skills = {tuple(key.split(", ")) : value for key, value in dict(load(f)).items()}
+
+    elif loader == "lazy bytes":
+        with open(path, "rb") as f:
+            skills = LazySkills(f.read())
+
+    else:
+        skills = LazySkills(path)
+
+    skills[next(iter(skills))]
+    taken = perf_counter() - start
+
+    if traced:
+        print(tracemalloc.get_traced_memory()[1])
+
+    else:
+        print(taken, peakRss() - before)
+
+
+if __name__ == "__main__":
+    if argv[1:2] == ["--child"]:
+        child(argv[2], argv[3], argv[4:5] == ["--traced"])
+        raise SystemExit
+
+    size = int(argv[1]) if len(argv) > 1 else 50000
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    with TemporaryDirectory() as folder:
+        path = os.path.join(folder, "skills.json")
+        with open(path, "w") as f:
+            dump({f"s{i}, skill{i}" : f"Strategy: skill number {i}.\n" * 20 for i in range(size)}, f)
+
+        print(f"{size} skills, {os.path.getsize(path) / 2**20:.1f} MiB file")
+        print(f"{'loader':>11} {'load (ms)':>10} {'peak RSS growth (MiB)':>22} {'peak Python heap (MiB)':>23}")
+
+        for loader in LOADERS:
+            command = [executable, __file__, "--child", loader, path]
+            timed = run(command, capture_output = True, text = True, cwd = here, check = True)
+            traced = run(command + ["--traced"], capture_output = True, text = True, cwd = here, check = True)
+
+            taken, rss = timed.stdout.split()
+            print(f"{loader:>11} {float(taken) * 1e3:>10.1f} {int(rss) / 1024:>22.1f} {int(traced.stdout) / 2**20:>23.1f}")
+
+        print("RSS for lazy mmap counts the pages of the file that were scanned. "
+            "They are shared page cache that the OS can drop, unlike the heap.")
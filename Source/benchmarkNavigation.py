@@ -0,0 +1,49 @@
+'''Times switching between the HOME and TOOLS pages,
+rebuilding each page on every switch like the old movePage, and with the PageManager.
+Needs a display. Run from the folder with skills.json: python Source/benchmarkNavigation.py'''
+
+from sys import argv
+from timeit import default_timer
+import RUAE_Revision_App as app
+
+def timeNavigation(move, runs: int) -> list:
+    '''Call move with alternating page classes and return the time of each switch in ms,
+    including drawing the result'''
+
+    targets = (app.ToolsPage, app.InfoPage)
+    times = []
+
+    for run in range(runs):
+        start = default_timer()
+        move(targets[run % 2])
+        app.WINDOW.update()
+        times.append((default_timer() - start) * 1e3)
+
+    return times
+
+
+def summary(name: str, times: list) -> str:
+    times = sorted(times)
+    return f"{name:>8}: mean {sum(times) / len(times):.2f} ms, p95 {times[int(len(times) * 0.95)]:.2f} ms"
+
+
+if __name__ == "__main__":
+    runs = int(argv[1]) if len(argv) > 1 else 200
+
+    #the old way: destroy whatever is shown and build the target from scratch
+    shown = [app.InfoPage()]
+
+    def rebuild(target):
+        shown[0].destroy()
+        shown[0] = target()
+
+    before = timeNavigation(rebuild, runs)
+    shown[0].destroy()
+
+    app.pages.show(app.InfoPage)
+    after = timeNavigation(app.pages.show, runs)
+
+    print(summary("rebuild", before))
+    print(summary("manager", after))
+
+    app.WINDOW.destroy()
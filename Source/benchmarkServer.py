@@ -0,0 +1,99 @@
+'''Load tests the skills HTTP server and reports requests per second and latency percentiles.
+Without a url, a server for a fake bank of 10000 skills is started in this process,
+so the clients and the server share the CPU. Pass the url of a server started with
+"RUAE_Revision.py --serve" to test it on its own.
+Run from this folder: python benchmarkServer.py [clients] [requests per client] [url]'''
+
+from http.client import HTTPConnection
+from json import loads
+from random import Random
+from sys import argv
+from threading import Thread
+from time import perf_counter
+from urllib.parse import urlsplit, quote
+from benchmarkLookup import makeBank
+from Modules.SkillIndex import SkillIndex
+from Modules.SkillServer import SkillServer
+
+def client(host: str, port: int, aliases: list, etag: str, requests: int, seed: int, latencies: list):
+    '''Send requests over one kept alive connection, adding each one's latency in ms to latencies.
+    Most are lookups of one skill, the rest fetch the whole bank, usually with its ETag so it is a 304'''
+
+    random = Random(seed)
+    connection = HTTPConnection(host, port)
+    taken = []
+
+    for i in range(requests):
+        roll = random.random()
+        headers = {"Accept-Encoding" : "gzip"}
+
+        if roll < 0.7:
+            path = f"/skills/{quote(random.choice(aliases))}"
+
+        else:
+            path = "/skills"
+            if roll < 0.9:
+                headers["If-None-Match"] = etag
+
+        start = perf_counter()
+        connection.request("GET", path, headers = headers)
+        response = connection.getresponse()
+        response.read()
+        taken.append((perf_counter() - start) * 1000)
+
+        if response.status not in (200, 304):
+            raise RuntimeError(f"{path} gave {response.status}")
+
+    connection.close()
+    latencies.extend(taken)
+
+
+def percentile(ordered: list, percent: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+if __name__ == "__main__":
+    clients = int(argv[1]) if len(argv) > 1 else 16
+    requests = int(argv[2]) if len(argv) > 2 else 500
+    server = None
+
+    if len(argv) > 3:
+        url = urlsplit(argv[3])
+        host, port = url.hostname, url.port or 80
+
+    else:
+        index = SkillIndex(makeBank(10000))
+        server = SkillServer(("127.0.0.1", 0), lambda: index)
+        Thread(target = server.serve_forever, daemon = True).start()
+        host, port = server.server_address
+
+    #learn the aliases and the bank's ETag the way a browser would
+    connection = HTTPConnection(host, port)
+    connection.request("GET", "/skills", headers = {"Accept-Encoding" : "gzip"})
+    response = connection.getresponse()
+    etag = response.getheader("ETag")
+    response.read()
+    connection.request("GET", "/skills")
+    aliases = [alias for key in loads(connection.getresponse().read()) for alias in key.split(", ")]
+    connection.close()
+
+    latencies = []
+    threads = [Thread(target = client, args = (host, port, aliases, etag, requests, seed, latencies)) for seed in range(clients)]
+
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = perf_counter() - start
+
+    latencies.sort()
+    print(f"{clients} clients x {requests} requests against {host}:{port}")
+    print(f"requests/s: {len(latencies) / elapsed:.0f}")
+    print(f"latency ms: p50 {percentile(latencies, 50):.2f}, p99 {percentile(latencies, 99):.2f}, max {latencies[-1]:.2f}")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
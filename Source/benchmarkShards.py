@@ -0,0 +1,46 @@
+'''Compares reading a folder of skills packs one after another and in a process pool,
+and shows how little is read when only one alias is looked up.
+Run from this folder: python benchmarkShards.py [number of packs] [skills per pack]'''
+
+from json import dump
+from os import path, cpu_count
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from Modules.SkillShards import ShardedSkills
+
+def makePacks(folder: str, packs: int, size: int):
+    '''Write packs fake subject packs of size skills each into folder'''
+
+    for pack in range(packs):
+        with open(path.join(folder, f"subject{pack}.json"), "w") as f:
+            dump({f"p{pack}s{i}, pack{pack}skill{i}" : f"Strategy: skill {i} of subject {pack}.\n" * 10
+                for i in range(size)}, f)
+
+
+if __name__ == "__main__":
+    packs = int(argv[1]) if len(argv) > 1 else 8
+    size = int(argv[2]) if len(argv) > 2 else 20000
+
+    with TemporaryDirectory() as folder:
+        makePacks(folder, packs, size)
+
+        start = perf_counter()
+        ShardedSkills(folder)
+        print(f"first open, building the index: {(perf_counter() - start) * 1e3:.1f} ms")
+
+        start = perf_counter()
+        shards = ShardedSkills(folder)
+        print(f"open with the index:            {(perf_counter() - start) * 1e3:.1f} ms")
+
+        start = perf_counter()
+        shards.get("pack0skill5")
+        print(f"first lookup, reads one pack:   {(perf_counter() - start) * 1e3:.1f} ms")
+
+        for parallel in (False, True):
+            shards = ShardedSkills(folder)
+            start = perf_counter()
+            shards.loadAll(parallel = parallel)
+            print(f"load all {'in parallel' if parallel else 'serially':<11}:         {(perf_counter() - start) * 1e3:.1f} ms")
+
+        print(f"{packs} packs, {len(shards)} skills, {cpu_count()} CPUs")
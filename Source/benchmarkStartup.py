@@ -0,0 +1,72 @@
+'''Guards the cold start time of the command line app.
+Imports RUAE_Revision in fresh interpreters with -X importtime, reports the slowest imports,
+and fails if the import takes too long or loads any of the GUI or database modules.
+Run from this folder: python benchmarkStartup.py [runs] [budget in ms]'''
+
+from statistics import median
+from subprocess import run
+from sys import argv, executable, exit
+import os
+
+#modules the command line must not import unless they are needed
+FORBIDDEN = ("tkinter", "_tkinter", "sqlite3", "multiprocessing", "asyncio")
+
+CHILD = f'''
+import sys
+import RUAE_Revision
+print(",".join(name for name in {FORBIDDEN!r} if name in sys.modules))
+'''
+
+def importTimes(here: str) -> tuple:
+    '''Import RUAE_Revision in a new interpreter.
+    Returns (dict of module : cumulative microseconds, list of forbidden modules that were imported)'''
+
+    result = run([executable, "-X", "importtime", "-c", CHILD], capture_output = True, text = True, cwd = here, check = True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return times, loaded
+
+
+if __name__ == "__main__":
+    runs = int(argv[1]) if len(argv) > 1 else 10
+    budget = float(argv[2]) if len(argv) > 2 else 60.0
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    totals = []
+    slowest = {}
+    loaded = set()
+
+    for _ in range(runs):
+        times, forbidden = importTimes(here)
+        totals.append(times["RUAE_Revision"] / 1000)
+        loaded.update(forbidden)
+
+        for name, taken in times.items():
+            slowest.setdefault(name, []).append(taken / 1000)
+
+    total = median(totals)
+    print(f"import RUAE_Revision: median {total:.1f} ms over {runs} runs (budget {budget:.0f} ms)")
+
+    print("slowest imports (median cumulative ms):")
+    ranked = sorted(((median(taken), name) for name, taken in slowest.items() if name != "RUAE_Revision"), reverse = True)
+    for taken, name in ranked[:10]:
+        print(f"{taken:>8.1f}  {name}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: the command line imported {', '.join(sorted(loaded))}")
+        failed = True
+
+    if total > budget:
+        print(f"FAIL: import took {total:.1f} ms, over the {budget:.0f} ms budget")
+        failed = True
+
+    exit(1 if failed else 0)
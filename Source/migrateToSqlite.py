@@ -0,0 +1,29 @@
+'''Imports a skills file into a skills database for RUAE_Revision to use instead.
+Usage: python migrateToSqlite.py [skills file] [database] [subject]
+Defaults to skills.json, skills.db and no subject.
+Run it again after editing the skills file to update the database'''
+
+from sys import argv, exit
+from Modules.SkillStore import SkillStore
+from RUAE_Revision import parseSkills
+from json import decoder
+
+if __name__ == "__main__":
+    source = argv[1] if len(argv) > 1 else "skills.json"
+    target = argv[2] if len(argv) > 2 else "skills.db"
+    subject = argv[3] if len(argv) > 3 else ""
+
+    try:
+        with open(source, "rb") as f:
+            skills = parseSkills(f.read())
+
+    except (OSError, decoder.JSONDecodeError) as error:
+        print(f"Could not read {source}: {error}")
+        exit(1)
+
+    store = SkillStore(target)
+    #skills deleted from the file are deleted from the subject too
+    added = store.importSkills(skills, subject = subject, replace = True)
+    store.close()
+
+    print(f"Imported {added} skills from {source} into {target}")
@@ -1,5 +1,6 @@
 from json import dump
 from typing import List, Dict
+from sys import argv
 
 # modify this dict
 # format = aliases : info
@@ -20,6 +21,19 @@ toSend: Dict[str , str] = {
     Tip: agree with the question.'''
 }
 
-#write to file
-with open("skills.json", "w") as f:
-    json = dump(toSend, f)
+if __name__ == "__main__":
+    #write to file
+    with open("skills.json", "w") as f:
+        json = dump(toSend, f)
+
+    #compile the binary pack that RUAE_Revision.py opens instead of skills.json
+    if "--pack" in argv:
+        from Modules.SkillPack import writePack
+        writePack(toSend, "skills.pack")
+
+    #import into the skills database in one transaction
+    if "--sqlite" in argv:
+        from Modules.SkillStore import SkillStore
+        store = SkillStore("skills.db")
+        store.importSkills(toSend, replace = True)
+        store.close()